@@ -1,8 +1,52 @@
+import os
+from collections.abc import Mapping
+from datetime import datetime
 from flask import Flask, render_template, request, jsonify
-from iching_core.hexagram_generator import HexagramGenerator
-from iching_core.hexagram_analyzer import HexagramAnalyzer
+from flask.json.provider import DefaultJSONProvider
+from iching_core.analysis_cache import AnalysisCache
+from iching_core.analysis_result import InvalidSectionsError, LazyAnalysis
+from iching_core import frozen_record, services
+from iching_core.instrumentation import REGISTRY as analysis_metrics
+
+class AnalysisJSONProvider(DefaultJSONProvider):
+    """支持按需计算的分析报告（Mapping）与共享只读记录的 JSON 序列化
+
+    输出格式与 frozen_record.FRAGMENT_FORMAT 一致（紧凑、不转义中文、不排序键），
+    共享只读记录直接嵌入其预先序列化的片段。
+    """
+
+    ensure_ascii = False
+    sort_keys = False
+    compact = True
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, LazyAnalysis):
+            return o.to_dict()
+        if isinstance(o, Mapping):
+            return dict(o)
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        # 共享的只读记录：输出格式与其预先序列化的片段一致时直接嵌入（默认如此），否则按普通字典编码
+        kwargs.setdefault("default", self.default)
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        return frozen_record.dumps(obj, **kwargs)
 
 app = Flask(__name__)
+app.json = AnalysisJSONProvider(app)
+
+# 共享服务：启动时创建起卦器并预热卦辞分片与静态分析数据包
+services.initialize()
+generator = services.get_generator()
+
+# 分析结果缓存：同一卦、动爻与时段的分析只计算一次
+analysis_cache = AnalysisCache()
+
+# 分析耗时统计：ICHING_INSTRUMENT=1 开启，=alloc 时同时记录内存分配
+if os.environ.get('ICHING_INSTRUMENT'):
+    analysis_metrics.enable(trace_allocations=os.environ['ICHING_INSTRUMENT'] == 'alloc')
 
 @app.route('/')
 def index():
@@ -18,14 +62,21 @@ def analyze():
         data = request.get_json()
         topic = data.get('topic', '')
         template = data.get('template', 'traditional')
+        # 只计算并返回请求的段，如 ?fields=basic_info,hexagram_info
+        fields = request.args.get('fields')
+        sections = [field.strip() for field in fields.split(',') if field.strip()] if fields else None
         
-        # 生成卦象
-        generator = HexagramGenerator()
-        hexagram = generator.generate_hexagram(topic)
+        # 生成卦象（共用进程内的起卦器）
+        hexagram = generator.generate_hexagram(topic, time=datetime.now())
         
-        # 分析卦象
-        analyzer = HexagramAnalyzer(hexagram)
-        analysis_result = analyzer.generate_analysis()
+        # 分析卦象：段名在此校验，各段在序列化时才计算，计算中的错误按服务端错误处理
+        try:
+            analysis_result = analysis_cache.get(hexagram, sections)
+        except InvalidSectionsError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
         return jsonify({
             'success': True,
@@ -37,5 +88,17 @@ def analyze():
             'error': str(e)
         }), 500
 
+@app.route('/cache/stats')
+def cache_stats():
+    return jsonify(analysis_cache.stats())
+
+@app.route('/services/status')
+def services_status():
+    return jsonify(services.status())
+
+@app.route('/analysis/stats')
+def analysis_stats():
+    return jsonify(analysis_metrics.snapshot())
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
\ No newline at end of file
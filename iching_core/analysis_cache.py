@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple, Union
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.hexagram import Hexagram, FrozenHexagram
+from iching_core.hexagram_analyzer import HexagramAnalyzer
+from iching_core.analysis_result import InvalidSectionsError, LazyAnalysis
+from iching_core.time_calculator import solar_term_index
+
+def analysis_key(hexagram: Union[Hexagram, FrozenHexagram]) -> Tuple[Hashable, ...]:
+    """分析结果的缓存键：本卦、动爻掩码与粗粒度时间（节气、日干）
+
+    纳甲干支由卦码决定，五行旺衰由节气决定，六神、十神由日干决定。
+
+    时间（精确到秒）与主题只影响 basic_info，不参与键，命中后再填入。
+    """
+    return (
+        hexagram.code,
+        hexagram.mask,
+        solar_term_index(hexagram.time),
+        hexagram.celestial_stem
+    )
+
+class AnalysisCache:
+    """generate_analysis 结果缓存（LRU + TTL）
+
+    缓存的是按需计算的报告，各段首次被请求时才计算并留在缓存中。
+    命中时返回选定段的视图，basic_info 复制后填入本次的时间和主题，
+    其余各段与缓存共用，调用方不应修改。
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 3600.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            maxsize: 最多缓存的结果数，超出时淘汰最久未用的
+            ttl: 结果有效期（秒），None 表示不过期
+            clock: 计时函数
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple, Tuple[float, LazyAnalysis]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, hexagram: Union[Hexagram, FrozenHexagram],
+            sections: Optional[Iterable[str]] = None) -> LazyAnalysis:
+        """获取卦象的分析报告，未命中时创建并缓存
+
+        Args:
+            hexagram: 卦象
+            sections: 需要的段，缺省为全部
+        """
+        # 先校验段名，无效请求不计入命中统计，也不占用缓存
+        if sections is not None:
+            sections = tuple(sections)
+            invalid = [section for section in sections if section not in HexagramAnalyzer.ANALYSIS_SECTIONS]
+            if invalid:
+                raise InvalidSectionsError(f"Invalid analysis sections: {', '.join(invalid)}")
+        key = analysis_key(hexagram)
+        result = self._lookup(key)
+        if result is None:
+            result = HexagramAnalyzer(hexagram).generate_analysis()
+            self._store(key, result)
+        return self._patch(result, hexagram, sections)
+
+    def _lookup(self, key: Tuple) -> Optional[LazyAnalysis]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, result = entry
+            if self.ttl is not None and self._clock() - stored_at > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def _store(self, key: Tuple, result: LazyAnalysis) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _patch(self, result: LazyAnalysis, hexagram: Union[Hexagram, FrozenHexagram],
+               sections: Optional[Iterable[str]] = None) -> LazyAnalysis:
+        """选取所需段，并填入本次请求的时间与主题"""
+        view = result.select(sections)
+        if "basic_info" not in view:
+            return view
+        basic_info = dict(result["basic_info"])
+        basic_info["time"] = hexagram.time
+        basic_info["topic"] = hexagram.topic
+        return view.select(overrides={"basic_info": basic_info})
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Union[int, float, None]]:
+        """缓存统计，供监控使用"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,97 @@
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+class NodeCache:
+    """单个分析器实例的节点结果与耗时记录"""
+
+    def __init__(self):
+        self.results: Dict[str, Any] = {}
+        # 节点名 -> (总耗时, 自身耗时)，自身耗时不含所依赖节点
+        self.timings: Dict[str, Tuple[float, float]] = {}
+        self._stack: List[float] = []
+        self._lock = threading.RLock()
+
+class AnalysisNode:
+    """分析节点：无参分析方法，每个实例只计算一次
+
+    depends 显式声明所依赖的节点，构成分析依赖图；
+    实际耗时记录在实例的 NodeCache 中。
+    """
+
+    def __init__(self, func: Callable, depends: Tuple[str, ...]):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.name = func.__name__
+        self.depends = depends
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return functools.partial(self.evaluate, instance)
+
+    def evaluate(self, instance) -> Any:
+        """计算（或取出已缓存的）节点结果"""
+        cache: NodeCache = instance._nodes
+        with cache._lock:
+            if self.name in cache.results:
+                return cache.results[self.name]
+            cache._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                value = self.func(instance)
+            finally:
+                elapsed = time.perf_counter() - start
+                child_time = cache._stack.pop()
+                if cache._stack:
+                    cache._stack[-1] += elapsed
+            cache.timings[self.name] = (elapsed, elapsed - child_time)
+            cache.results[self.name] = value
+            return value
+
+def analysis_node(*depends: str) -> Callable[[Callable], AnalysisNode]:
+    """将无参分析方法声明为分析节点
+
+    Args:
+        depends: 所依赖的节点名
+    """
+    def decorator(func: Callable) -> AnalysisNode:
+        return AnalysisNode(func, depends)
+    return decorator
+
+def analysis_graph(cls) -> Dict[str, Tuple[str, ...]]:
+    """类的分析依赖图：节点名 -> 所依赖的节点名"""
+    graph = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if isinstance(value, AnalysisNode):
+                graph[name] = value.depends
+    return graph
+
+def check_graph(cls) -> None:
+    """检查依赖图：依赖须为已声明的节点，且不能成环"""
+    graph = analysis_graph(cls)
+    for name, depends in graph.items():
+        unknown = [dep for dep in depends if dep not in graph]
+        if unknown:
+            raise ValueError(f"Analysis node {name} depends on unknown nodes: {', '.join(unknown)}")
+
+    # 深度优先检查环：1 访问中，2 已完成
+    state: Dict[str, int] = {}
+
+    def visit(name: str, path: Tuple[str, ...]) -> None:
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            raise ValueError(f"Cyclic analysis dependency: {' -> '.join(path + (name,))}")
+        state[name] = 1
+        for dep in graph[name]:
+            visit(dep, path + (name,))
+        state[name] = 2
+
+    for name in graph:
+        visit(name, ())
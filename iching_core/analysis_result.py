@@ -0,0 +1,85 @@
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from iching_core.instrumentation import REGISTRY, instrumented
+
+class InvalidSectionsError(ValueError):
+    """请求了不存在的分析段"""
+
+class LazyAnalysis(Mapping):
+    """按需计算的分析报告
+
+    各段在首次访问时才调用分析器计算，结果记入共享的备忘表；
+    只包含选定的段，序列化时也只输出这些段。
+    select() 得到的视图与原报告共用分析器和备忘表。
+    """
+
+    __slots__ = ("_analyzer", "_sections", "_computed", "_overrides")
+
+    def __init__(self, analyzer, sections: Optional[Iterable[str]] = None,
+                 computed: Optional[Dict[str, Any]] = None,
+                 overrides: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            analyzer: HexagramAnalyzer 实例
+            sections: 包含的段，缺省为全部
+            computed: 已计算各段的备忘表（视图之间共享）
+            overrides: 仅对本视图生效的段值（如填入本次请求时间的 basic_info）
+        """
+        available = analyzer.ANALYSIS_SECTIONS
+        if sections is None:
+            sections = tuple(available)
+        else:
+            sections = tuple(sections)
+            invalid = [section for section in sections if section not in available]
+            if invalid:
+                raise InvalidSectionsError(f"Invalid analysis sections: {', '.join(invalid)}")
+        self._analyzer = analyzer
+        self._sections = sections
+        self._computed = {} if computed is None else computed
+        self._overrides = overrides or {}
+
+    def __getitem__(self, section: str) -> Any:
+        if section not in self._sections:
+            raise KeyError(section)
+        if section in self._overrides:
+            return self._overrides[section]
+        if section not in self._computed:
+            method = self._analyzer.ANALYSIS_SECTIONS[section]
+            self._computed[section] = REGISTRY.call(f"section.{section}", getattr(self._analyzer, method))
+        return self._computed[section]
+
+    def __contains__(self, section: object) -> bool:
+        # 只判断是否选定，不触发计算
+        return section in self._sections
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sections)
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def __repr__(self) -> str:
+        computed = [section for section in self._sections
+                    if section in self._computed or section in self._overrides]
+        return f"LazyAnalysis(sections={list(self._sections)}, computed={computed})"
+
+    @property
+    def sections(self) -> tuple:
+        """包含的段"""
+        return self._sections
+
+    def select(self, sections: Optional[Iterable[str]] = None,
+               overrides: Optional[Dict[str, Any]] = None) -> "LazyAnalysis":
+        """选取部分段（并可覆盖部分段值）得到新视图"""
+        merged = dict(self._overrides)
+        merged.update(overrides or {})
+        return LazyAnalysis(self._analyzer, self._sections if sections is None else sections,
+                            self._computed, merged)
+
+    @instrumented("analysis.materialize")
+    def to_dict(self) -> Dict[str, Any]:
+        """计算全部选定段并转换为字典（记入耗时统计，包含各段的计算）"""
+        return {section: self[section] for section in self._sections}
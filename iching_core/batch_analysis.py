@@ -0,0 +1,185 @@
+import bisect
+from datetime import datetime
+from functools import lru_cache
+from typing import List, NamedTuple, Tuple
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.hexagram import FrozenHexagram
+from iching_core.five_elements import FiveElements, RELATION_TYPE_INDEX
+from iching_core.time_calculator import (
+    SEASONAL_FAVORABLE_TABLE, day_cycle_index, day_cycle_indices, solar_term_index, solar_term_indices
+)
+
+# 等级名称，批量结果中以序号表示
+STATUS_LEVELS = ("极佳", "良好", "一般", "欠佳", "不利")
+CONFIDENCE_LEVELS = ("很高", "较高", "中等", "较低")
+
+ELEMENT_INDEX = {element: i for i, element in enumerate(FiveElements.ELEMENTS)}
+# 三位卦码 -> 五行序号
+TRIGRAM_ELEMENT_INDEX = np.array([ELEMENT_INDEX[e] for e in FiveElements.TRIGRAM_ELEMENT_TABLE], dtype=np.intp)
+# 日干序号 -> 五行序号
+STEM_ELEMENT_INDEX = np.array(
+    [ELEMENT_INDEX[FiveElements.NAJIA[stem]] for stem in "甲乙丙丁戊己庚辛壬癸"], dtype=np.intp
+)
+
+def _relation_table() -> Tuple[np.ndarray, np.ndarray]:
+    """5×5 五行关系表：是否计入生克泄化、是否为有利的生或化"""
+    type_id = FiveElements.RELATION_MATRIX.type_id
+    counted = np.isin(type_id, [RELATION_TYPE_INDEX[t] for t in ("生", "克", "泄", "化")])
+    favorable = np.isin(type_id, [RELATION_TYPE_INDEX[t] for t in ("生", "化")])
+    return counted, favorable
+
+RELATION_COUNTED, RELATION_FAVORABLE = _relation_table()
+
+# 爻位（1-6）的力量加成：三四爻居中 +0.1，二五爻得中 +0.05
+POSITION_BONUS = np.array([0.0, 0.05, 0.1, 0.1, 0.05, 0.0])
+# 爻位阴阳：一三五为阳位
+POSITION_YANG = np.array([1, 0, 1, 0, 1, 0], dtype=np.uint8)
+
+class BatchAnalysis(NamedTuple):
+    """批量分析的数值结果（按列存储）"""
+    line_strengths: np.ndarray  # (n, 6) 各爻力量
+    balance_score: np.ndarray  # (n,) 五行平衡度 0-1
+    favorable_score: np.ndarray  # (n,) 五行有利度 0-100
+    status_level: np.ndarray  # (n,) STATUS_LEVELS 序号
+    momentum: np.ndarray  # (n,) 发展动力
+    stability: np.ndarray  # (n,) 稳定性
+    potential: np.ndarray  # (n,) 发展潜力
+    confidence_score: np.ndarray  # (n,) 预测可信度
+    confidence_level: np.ndarray  # (n,) CONFIDENCE_LEVELS 序号
+
+class AnalysisScore(NamedTuple):
+    """单卦分析的数值结果（固定布局，可直接排序、筛选）"""
+    favorable_score: float  # 五行有利度 0-100
+    status_level: int  # STATUS_LEVELS 序号
+    balance_score: float  # 五行平衡度 0-1
+    momentum: float  # 发展动力
+    stability: float  # 稳定性
+    potential: float  # 发展潜力
+    confidence_score: float  # 预测可信度
+    confidence_level: int  # CONFIDENCE_LEVELS 序号
+
+@lru_cache(maxsize=None)
+def trend_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """按 code << 6 | mask 索引的趋势指标与可信度表（动力、稳定性、潜力、可信度）
+
+    趋势只由本卦与动爻决定，首次调用时由逐卦分析计算全部 4096 种组合。
+    """
+    from iching_core.hexagram_analyzer import HexagramAnalyzer
+
+    time = datetime(2000, 1, 1)
+    tables = np.zeros((4, 4096))
+    for code in range(64):
+        for mask in range(64):
+            trends = HexagramAnalyzer(FrozenHexagram(code, mask, time)).predict_trends()
+            indicators = trends["indicators"]
+            tables[:, code << 6 | mask] = (
+                indicators["momentum"], indicators["stability"], indicators["potential"],
+                trends["confidence_level"]["score"]
+            )
+    for table in tables:
+        table.flags.writeable = False
+    return tuple(tables)
+
+def line_strengths(codes: np.ndarray, masks: np.ndarray) -> np.ndarray:
+    """各爻力量（与 HexagramAnalyzer._get_line_strength 一致）"""
+    shifts = np.arange(6, dtype=np.uint8)
+    lines = (codes[:, None] >> shifts) & 1
+    changing = (masks[:, None] >> shifts) & 1
+    strengths = 0.5 + POSITION_BONUS + 0.1 * (lines == POSITION_YANG) + 0.15 * changing
+    return np.minimum(strengths, 1.0)
+
+def analyze_many(codes, masks, times) -> BatchAnalysis:
+    """批量计算分析报告中的数值部分，不生成文字
+
+    时间五行取起卦日的日干五行，旺衰按起卦时的节气月令。
+
+    Args:
+        codes: 本卦编码数组
+        masks: 动爻掩码数组
+        times: 起卦时间（datetime 序列或 datetime64 数组，可为单个时间）
+    """
+    codes = np.asarray(codes, dtype=np.uint8)
+    masks = np.asarray(masks, dtype=np.uint8)
+    times = np.broadcast_to(np.asarray(times, dtype="datetime64[m]"), codes.shape)
+
+    # 上下卦与时间的五行
+    upper = TRIGRAM_ELEMENT_INDEX[codes >> 3]
+    lower = TRIGRAM_ELEMENT_INDEX[codes & 7]
+    time_element = STEM_ELEMENT_INDEX[day_cycle_indices(times) % 10]
+
+    # 五行平衡度：上下卦各计2、时间计1，共5，理想为各1
+    elements = np.arange(5)
+    counts = 2 * (upper[:, None] == elements) + 2 * (lower[:, None] == elements) \
+        + (time_element[:, None] == elements)
+    variance = ((counts - 1) ** 2).sum(axis=1) / 5
+    balance_score = np.round(1 - variance, 2)
+
+    # 生克关系：上下卦、时间与上卦、时间与下卦
+    pairs = ((upper, lower), (time_element, upper), (time_element, lower))
+    counted = sum(RELATION_COUNTED[a, b].astype(np.int64) for a, b in pairs)
+    favorable = sum(RELATION_FAVORABLE[a, b].astype(np.int64) for a, b in pairs)
+    favorable_ratio = np.divide(favorable, counted, out=np.zeros(len(codes)), where=counted > 0)
+
+    # 季节：时间五行在节气月令中旺或相则有利
+    seasonal = SEASONAL_FAVORABLE_TABLE[time_element, solar_term_indices(times)]
+
+    favorable_score = np.round(balance_score * 30 + favorable_ratio * 40 + seasonal * 30, 1)
+    status_level = 4 - np.searchsorted([20, 40, 60, 80], favorable_score, side="right")
+
+    momentum, stability, potential, confidence = trend_tables()
+    cells = codes.astype(np.intp) << 6 | masks
+    confidence_score = confidence[cells]
+    confidence_level = 3 - np.searchsorted([0.4, 0.6, 0.8], confidence_score, side="left")
+
+    return BatchAnalysis(
+        line_strengths(codes, masks), balance_score, favorable_score, status_level.astype(np.uint8),
+        momentum[cells], stability[cells], potential[cells], confidence_score, confidence_level.astype(np.uint8)
+    )
+
+@lru_cache(maxsize=None)
+def _scalar_tables() -> Tuple[List, ...]:
+    """单卦评分用的 Python 列表形式的查找表"""
+    return (
+        TRIGRAM_ELEMENT_INDEX.tolist(), STEM_ELEMENT_INDEX.tolist(), SEASONAL_FAVORABLE_TABLE.tolist(),
+        RELATION_COUNTED.tolist(), RELATION_FAVORABLE.tolist(), *(table.tolist() for table in trend_tables())
+    )
+
+def score(code: int, mask: int, time: datetime) -> AnalysisScore:
+    """单卦评分：与 analyze_many 的一行相同，不构建任何字典或文字"""
+    trigram_elements, stem_elements, seasonal_favorable, counted_table, favorable_table, \
+        momentum, stability, potential, confidence = _scalar_tables()
+
+    upper = trigram_elements[code >> 3]
+    lower = trigram_elements[code & 7]
+    time_element = stem_elements[day_cycle_index(time) % 10]
+
+    counts = [0, 0, 0, 0, 0]
+    counts[upper] += 2
+    counts[lower] += 2
+    counts[time_element] += 1
+    balance_score = round(1 - sum((count - 1) ** 2 for count in counts) / 5, 2)
+
+    counted = counted_table[upper][lower] + counted_table[time_element][upper] + counted_table[time_element][lower]
+    favorable = favorable_table[upper][lower] + favorable_table[time_element][upper] \
+        + favorable_table[time_element][lower]
+    favorable_ratio = favorable / counted if counted else 0.0
+    seasonal = seasonal_favorable[time_element][solar_term_index(time)]
+
+    favorable_score = round(balance_score * 30 + favorable_ratio * 40 + (30 if seasonal else 0), 1)
+    cell = code << 6 | mask
+    confidence_score = confidence[cell]
+    return AnalysisScore(
+        favorable_score,
+        4 - bisect.bisect_right((20, 40, 60, 80), favorable_score),
+        balance_score,
+        momentum[cell],
+        stability[cell],
+        potential[cell],
+        confidence_score,
+        3 - bisect.bisect_left((0.4, 0.6, 0.8), confidence_score)
+    )
@@ -0,0 +1,162 @@
+import bisect
+import secrets
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+class CastRNG:
+    """起卦随机流
+
+    基于 Philox 计数器生成器：每一卦占用一个 64 位随机字，
+    第 k 卦的随机字只由 (seed, stream, k) 决定，
+    因此可按序号重放任意一卦，不同 stream 之间互不相关。
+    """
+
+    # Philox 每个计数器块输出的 64 位字数
+    WORDS_PER_BLOCK = 4
+
+    def __init__(self, seed: Optional[int] = None, stream: int = 0):
+        if seed is None:
+            seed = secrets.randbits(64)
+        if not 0 <= seed < 1 << 64:
+            raise ValueError(f"Invalid seed: {seed}")
+        if not 0 <= stream < 1 << 64:
+            raise ValueError(f"Invalid stream: {stream}")
+        self.seed = seed
+        self.stream = stream
+        self._key = stream << 64 | seed
+
+    def words(self, start: int, n: int) -> np.ndarray:
+        """获取第 start 卦起连续 n 卦的随机字"""
+        block, offset = divmod(start, self.WORDS_PER_BLOCK)
+        bit_generator = np.random.Philox(key=self._key, counter=block)
+        return bit_generator.random_raw(offset + n)[offset:]
+
+    def word(self, index: int) -> int:
+        """获取第 index 卦的随机字"""
+        return int(self.words(index, 1)[0])
+
+# 先天八卦数（乾1 兑2 离3 震4 巽5 坎6 艮7 坤8）对应的三位卦码，按除8余数索引（余0为坤）
+XIANTIAN_TRIGRAMS = (0, 7, 3, 5, 1, 6, 2, 4)
+
+class CastingEngine(ABC):
+    """起卦法基类
+
+    子类由随机字（及起卦时间、主题）得到六爻爻值 6/7/8/9，
+    单卦与批量均为查表或算术运算，不做逐次模拟。
+    """
+
+    name = ""
+    # 爻值 6/7/8/9 的概率，非随机起卦法为 None
+    line_probabilities: Optional[Tuple[float, float, float, float]] = None
+
+    @abstractmethod
+    def cast(self, word: int, time: datetime, topic: str = "") -> Tuple[int, ...]:
+        """起一卦，返回自下而上的六个爻值"""
+
+    @abstractmethod
+    def cast_batch(self, words: np.ndarray, times: np.ndarray, topic: str = "") -> np.ndarray:
+        """批量起卦，返回 (n, 6) 爻值数组"""
+
+class TableEngine(CastingEngine):
+    """查表起卦法：每爻取随机字的若干位，查表得到爻值"""
+
+    def __init__(self, table: Sequence[int]):
+        if len(table) & (len(table) - 1):
+            raise ValueError(f"Table size must be a power of two: {len(table)}")
+        self.table = tuple(table)
+        self.bits = (len(table) - 1).bit_length()
+        self._chunk_mask = len(table) - 1
+        self._table_array = np.array(table, dtype=np.uint8)
+        self._shifts = np.arange(0, 6 * self.bits, self.bits, dtype=np.uint64)
+
+    def cast(self, word: int, time: datetime, topic: str = "") -> Tuple[int, ...]:
+        return tuple(self.table[word >> (self.bits * i) & self._chunk_mask] for i in range(6))
+
+    def cast_batch(self, words: np.ndarray, times: np.ndarray, topic: str = "") -> np.ndarray:
+        return self._table_array[(words[:, None] >> self._shifts) & np.uint64(self._chunk_mask)]
+
+class CoinEngine(TableEngine):
+    """三钱法：每爻三枚铜钱，正面数 0/1/2/3 对应 老阴6/少阳7/少阴8/老阳9"""
+
+    name = "coin"
+    line_probabilities = (1 / 8, 3 / 8, 3 / 8, 1 / 8)
+
+    def __init__(self):
+        # 三位中正面（1）的个数加6即爻值
+        super().__init__([6 + bin(coins).count("1") for coins in range(8)])
+
+class YarrowEngine(TableEngine):
+    """大衍筮法：爻值 6/7/8/9 的概率为 1/16、5/16、7/16、3/16"""
+
+    name = "yarrow"
+    line_probabilities = (1 / 16, 5 / 16, 7 / 16, 3 / 16)
+    # 以十六分之一为单位的累积概率
+    CUMULATIVE = (1, 6, 13, 16)
+
+    def __init__(self):
+        super().__init__([6 + bisect.bisect_right(self.CUMULATIVE, u) for u in range(16)])
+
+class PlumBlossomEngine(CastingEngine):
+    """梅花易数时间起卦法
+
+    年支数 + 月 + 日（+ 主题字数）除8得上卦，再加时支数除8得下卦，除6得动爻。
+    尚无农历换算，月、日取公历。
+    """
+
+    name = "plum_blossom"
+
+    def cast(self, word: int, time: datetime, topic: str = "") -> Tuple[int, ...]:
+        year_number = (time.year - 4) % 12 + 1
+        hour_number = (time.hour + 1) // 2 % 12 + 1
+        upper_sum = year_number + time.month + time.day + len(topic)
+        total = upper_sum + hour_number
+        code = XIANTIAN_TRIGRAMS[upper_sum % 8] << 3 | XIANTIAN_TRIGRAMS[total % 8]
+        moving = (total - 1) % 6
+        return tuple(
+            (9 if code >> i & 1 else 6) if i == moving else (7 if code >> i & 1 else 8)
+            for i in range(6)
+        )
+
+    def cast_batch(self, words: np.ndarray, times: np.ndarray, topic: str = "") -> np.ndarray:
+        # 单个时间按卦数广播
+        times = np.broadcast_to(np.asarray(times, dtype="datetime64[m]"), words.shape)
+        years = times.astype("datetime64[Y]")
+        months = times.astype("datetime64[M]")
+        days = times.astype("datetime64[D]")
+        year_number = (years.astype(np.int64) + 1970 - 4) % 12 + 1
+        month = (months - years).astype(np.int64) + 1
+        day = (days - months).astype(np.int64) + 1
+        hour = (times.astype("datetime64[h]") - days).astype(np.int64)
+        hour_number = (hour + 1) // 2 % 12 + 1
+        upper_sum = year_number + month + day + len(topic)
+        total = upper_sum + hour_number
+        trigrams = np.array(XIANTIAN_TRIGRAMS, dtype=np.uint8)
+        codes = trigrams[upper_sum % 8] << 3 | trigrams[total % 8]
+        yang = (codes[:, None] >> np.arange(6, dtype=np.uint8)) & 1
+        moving = ((total - 1) % 6)[:, None] == np.arange(6)
+        # 阳爻 7/9，阴爻 8/6
+        return np.where(moving, 6 + 3 * yang, 8 - yang).astype(np.uint8)
+
+# 已注册的起卦法
+ENGINES: Dict[str, CastingEngine] = {}
+
+def register_engine(engine: CastingEngine) -> CastingEngine:
+    """注册起卦法"""
+    if not engine.name:
+        raise ValueError("Casting engine must have a name")
+    ENGINES[engine.name] = engine
+    return engine
+
+def get_engine(method: Union[str, CastingEngine]) -> CastingEngine:
+    """按名称获取起卦法"""
+    if isinstance(method, CastingEngine):
+        return method
+    if method not in ENGINES:
+        raise ValueError(f"Invalid casting method: {method}")
+    return ENGINES[method]
+
+for _engine in (CoinEngine(), YarrowEngine(), PlumBlossomEngine()):
+    register_engine(_engine)
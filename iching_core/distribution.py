@@ -0,0 +1,64 @@
+from functools import lru_cache
+from typing import NamedTuple, Union
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.hexagram import PALACE_TABLE
+from iching_core.casting import CastingEngine, get_engine
+
+# 动爻掩码 -> 动爻数
+CHANGING_COUNTS = np.array([bin(mask).count("1") for mask in range(64)], dtype=np.intp)
+# 卦码 XOR 掩码 -> 变卦编码，按 [code, mask] 索引
+CHANGED_CODES = np.arange(64)[:, None] ^ np.arange(64)[None, :]
+
+class OutcomeDistribution(NamedTuple):
+    """起卦结果的精确概率分布"""
+    joint: np.ndarray  # (64, 64) 本卦编码 × 动爻掩码
+    by_hexagram: np.ndarray  # (64,) 本卦
+    by_changed_hexagram: np.ndarray  # (64,) 变卦
+    by_palace: np.ndarray  # (8,) 宫位（八卦三位编码）
+    by_changing_count: np.ndarray  # (7,) 动爻数 0-6
+    by_changing_position: np.ndarray  # (6,) 各爻位为动爻的概率
+
+    def probability(self, code: int, mask: int) -> float:
+        """本卦为 code 且动爻掩码为 mask 的概率"""
+        return float(self.joint[code, mask])
+
+def line_matrix(line_probabilities) -> np.ndarray:
+    """单爻概率矩阵，按 [阴阳, 是否动爻] 索引"""
+    p6, p7, p8, p9 = line_probabilities
+    return np.array([[p8, p6], [p7, p9]], dtype=np.float64)
+
+def outcome_distribution(method: Union[str, CastingEngine] = "coin") -> OutcomeDistribution:
+    """计算起卦法在全部 4096 种 (本卦, 动爻) 结果上的精确分布"""
+    engine = get_engine(method)
+    if engine.line_probabilities is None:
+        raise ValueError(f"Casting method has no line distribution: {engine.name}")
+    return _distribution(tuple(engine.line_probabilities))
+
+@lru_cache(maxsize=None)
+def _distribution(line_probabilities) -> OutcomeDistribution:
+    matrix = line_matrix(line_probabilities)
+
+    # 六爻独立：逐爻做 Kronecker 积，第 i 爻落在卦码与掩码的第 i 位
+    joint = np.ones((1, 1))
+    for _ in range(6):
+        joint = np.kron(matrix, joint)
+
+    by_hexagram = joint.sum(axis=1)
+    by_mask = joint.sum(axis=0)
+    by_changed_hexagram = np.bincount(CHANGED_CODES.ravel(), weights=joint.ravel(), minlength=64)
+    by_palace = np.bincount(PALACE_TABLE, weights=by_hexagram, minlength=8)
+    by_changing_count = np.bincount(CHANGING_COUNTS, weights=by_mask, minlength=7)
+    by_changing_position = np.array([by_mask[(np.arange(64) >> i & 1).astype(bool)].sum() for i in range(6)])
+
+    distribution = OutcomeDistribution(
+        joint, by_hexagram, by_changed_hexagram, by_palace, by_changing_count, by_changing_position
+    )
+    # 结果被缓存共享，禁止原地修改
+    for array in distribution:
+        array.flags.writeable = False
+    return distribution
@@ -1,5 +1,109 @@
-from typing import Dict, List, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
 from enum import Enum
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from iching_core.frozen_record import FrozenRecord
+
+# 五行关系类型，关系矩阵中以序号表示
+RELATION_TYPES = ("生", "克", "泄", "化", "同类", "异类")
+RELATION_TYPE_INDEX = {relation_type: i for i, relation_type in enumerate(RELATION_TYPES)}
+
+# 各关系类型的基础强度
+RELATION_BASE_STRENGTH = {
+    "生": 0.8,   # 相生关系基础强度
+    "克": 0.6,   # 相克关系基础强度
+    "泄": 0.4,   # 相泄关系基础强度
+    "化": 0.7,   # 相化关系基础强度
+    "同类": 1.0,  # 同类关系基础强度
+    "异类": 0.3   # 异类关系基础强度
+}
+
+class RelationMatrix(NamedTuple):
+    """五行关系矩阵：[主五行序号][客五行序号]，序号按 FiveElements.ELEMENTS"""
+    type_id: np.ndarray  # RELATION_TYPES 序号
+    strength: np.ndarray  # 关系强度 0-1
+    favorable: np.ndarray  # 是否有利
+    description_id: np.ndarray  # FiveElements.RELATION_DESCRIPTIONS 序号
+
+def describe_relation(relation_type: Optional[str], element1: str, element2: str) -> str:
+    """五行关系的描述"""
+    if relation_type == "生":
+        return f"{element1}生{element2}，关系有利，注重滋养"
+    elif relation_type == "克":
+        return f"{element1}克{element2}，关系受制，需要平衡"
+    elif relation_type == "泄":
+        return f"{element1}泄于{element2}，关系消耗，注意补充"
+    elif relation_type == "化":
+        return f"{element1}化为{element2}，关系转化，把握变化"
+    elif element1 == element2:
+        return f"同属{element1}，关系和谐，注重稳定"
+    else:
+        return f"{element1}与{element2}异类，关系疏离，需要协调"
+
+def _build_relation_matrix(elements: List[str], relations: Dict[str, Dict[str, str]],
+                           seasons: Dict[str, str], directions: Dict[str, str]
+                           ) -> Tuple[RelationMatrix, Tuple[str, ...], Tuple[Tuple[Tuple, ...], ...]]:
+    """构建 5×5 关系矩阵、描述表（描述序号为 主序号 * 5 + 客序号）与单次查询用的记录表"""
+    size = len(elements)
+    type_id = np.full((size, size), RELATION_TYPE_INDEX["异类"], dtype=np.uint8)
+    strength = np.zeros((size, size))
+    descriptions = []
+    for i, element1 in enumerate(elements):
+        for j, element2 in enumerate(elements):
+            relation_type = next(
+                (rel_type for rel_type, rel_map in relations.items() if rel_map[element1] == element2), None
+            )
+            name = relation_type or ("同类" if element1 == element2 else "异类")
+            type_id[i, j] = RELATION_TYPE_INDEX[name]
+
+            # 同季节、同方位时关系加强
+            value = RELATION_BASE_STRENGTH[name]
+            if seasons[element1] == seasons[element2]:
+                value *= 1.2
+            if directions[element1] == directions[element2]:
+                value *= 1.1
+            strength[i, j] = min(1.0, value)
+            descriptions.append(describe_relation(relation_type, element1, element2))
+
+    favorable = np.isin(type_id, [RELATION_TYPE_INDEX[t] for t in ("生", "化", "同类")])
+    description_id = np.arange(size * size, dtype=np.uint8).reshape(size, size)
+    matrix = RelationMatrix(type_id, strength, favorable, description_id)
+    for array in matrix:
+        array.flags.writeable = False
+    records = tuple(
+        tuple(
+            (RELATION_TYPES[type_id[i, j]], float(strength[i, j]), descriptions[i * size + j], bool(favorable[i, j]))
+            for j in range(size)
+        )
+        for i in range(size)
+    )
+    return matrix, tuple(descriptions), records
+
+def _build_element_attributes(elements: List[str], directions: Dict, seasons: Dict, colors: Dict,
+                              hours: Dict, organs: Dict, emotions: Dict, weather: Dict, tastes: Dict,
+                              numbers: Dict, natures: Dict) -> Mapping[str, FrozenRecord]:
+    """构建五行 -> 完整属性的只读记录"""
+    return MappingProxyType({
+        element: FrozenRecord({
+            "element": element,
+            "direction": directions[element],
+            "season": seasons[element],
+            "color": colors[element],
+            "hours": hours[element],
+            "organs": organs[element],
+            "emotions": emotions[element],
+            "weather": weather[element],
+            "taste": tastes[element],
+            "numbers": numbers[element],
+            "nature": natures[element]
+        })
+        for element in elements
+    })
 
 class FiveElements:
     """五行关系分析类"""
@@ -140,61 +244,67 @@ class FiveElements:
         "艮": "土",
         "坤": "土"
     }
+    
+    # 八卦五行属性（按三位卦码索引：坤震坎兑艮离巽乾）
+    TRIGRAM_ELEMENT_TABLE = ("土", "木", "水", "金", "土", "火", "木", "金")
 
-    def get_element_attributes(self, element: str) -> Dict:
-        """获取五行的完整属性"""
-        if element not in self.ELEMENTS:
-            raise ValueError(f"Invalid element: {element}")
-            
-        return {
-            "element": element,
-            "direction": self.DIRECTIONS[element],
-            "season": self.SEASONS[element],
-            "color": self.COLORS[element],
-            "hours": self.HOURS[element],
-            "organs": self.ORGANS[element],
-            "emotions": self.EMOTIONS[element],
-            "weather": self.WEATHER[element],
-            "taste": self.TASTES[element],
-            "numbers": self.NUMBERS[element],
-            "nature": self.get_element_nature(element)
+    # 五行的性质和特征
+    ELEMENT_NATURES = {
+        "金": {
+            "性质": ["刚健", "收敛", "肃杀"],
+            "特征": ["坚韧", "锐利", "清洁"],
+            "物象": ["金属", "岩石", "矿物"],
+            "职能": ["断绝", "决断", "取舍"]
+        },
+        "木": {
+            "性质": ["生发", "向上", "舒展"],
+            "特征": ["柔韧", "曲直", "生长"],
+            "物象": ["树木", "草药", "花卉"],
+            "职能": ["疏达", "条达", "升发"]
+        },
+        "水": {
+            "性质": ["寒冷", "向下", "润泽"],
+            "特征": ["柔弱", "滋润", "通达"],
+            "物象": ["江河", "雨露", "泉源"],
+            "职能": ["浸润", "滋养", "藏精"]
+        },
+        "火": {
+            "性质": ["炎热", "向上", "光明"],
+            "特征": ["温暖", "明亮", "活跃"],
+            "物象": ["日月", "星辰", "火光"],
+            "职能": ["温煦", "蒸腾", "推动"]
+        },
+        "土": {
+            "性质": ["厚重", "中和", "承载"],
+            "特征": ["稳重", "包容", "中正"],
+            "物象": ["山岳", "大地", "田土"],
+            "职能": ["生化", "承载", "统摄"]
         }
+    }
 
-    def get_element_nature(self, element: str) -> Dict:
-        """获取五行的性质和特征"""
-        natures = {
-            "金": {
-                "性质": ["刚健", "收敛", "肃杀"],
-                "特征": ["坚韧", "锐利", "清洁"],
-                "物象": ["金属", "岩石", "矿物"],
-                "职能": ["断绝", "决断", "取舍"]
-            },
-            "木": {
-                "性质": ["生发", "向上", "舒展"],
-                "特征": ["柔韧", "曲直", "生长"],
-                "物象": ["树木", "草药", "花卉"],
-                "职能": ["疏达", "条达", "升发"]
-            },
-            "水": {
-                "性质": ["寒冷", "向下", "润泽"],
-                "特征": ["柔弱", "滋润", "通达"],
-                "物象": ["江河", "雨露", "泉源"],
-                "职能": ["浸润", "滋养", "藏精"]
-            },
-            "火": {
-                "性质": ["炎热", "向上", "光明"],
-                "特征": ["温暖", "明亮", "活跃"],
-                "物象": ["日月", "星辰", "火光"],
-                "职能": ["温煦", "蒸腾", "推动"]
-            },
-            "土": {
-                "性质": ["厚重", "中和", "承载"],
-                "特征": ["稳重", "包容", "中正"],
-                "物象": ["山岳", "大地", "田土"],
-                "职能": ["生化", "承载", "统摄"]
-            }
-        }
-        return natures[element]
+    # 五行完整属性：导入时构建的只读记录，各次分析共用
+    ELEMENT_ATTRIBUTES = _build_element_attributes(
+        ELEMENTS, DIRECTIONS, SEASONS, COLORS, HOURS, ORGANS, EMOTIONS, WEATHER, TASTES, NUMBERS, ELEMENT_NATURES
+    )
+
+    # 五行 -> 序号
+    ELEMENT_INDEX = {element: i for i, element in enumerate(ELEMENTS)}
+
+    # 5×5 关系矩阵、描述表，以及单次查询用的 [主][客] -> (类型, 强度, 描述, 是否有利)，导入时构建一次
+    RELATION_MATRIX, RELATION_DESCRIPTIONS, RELATION_RECORDS = _build_relation_matrix(
+        ELEMENTS, RELATIONS, SEASONS, DIRECTIONS
+    )
+
+    def get_element_attributes(self, element: str) -> Mapping:
+        """获取五行的完整属性（共享的只读记录，调用方不应也无法修改）"""
+        try:
+            return self.ELEMENT_ATTRIBUTES[element]
+        except KeyError:
+            raise ValueError(f"Invalid element: {element}") from None
+
+    def get_element_nature(self, element: str) -> Mapping:
+        """获取五行的性质和特征（共享的只读记录）"""
+        return self.ELEMENT_ATTRIBUTES[element]["nature"]
 
     def get_trigram_element(self, trigram: str) -> str:
         """获取卦象的五行属性"""
@@ -238,27 +348,39 @@ class FiveElements:
         }
         return recommendations[element]
 
+    @classmethod
+    def _relation_record(cls, element1: str, element2: str) -> Tuple[str, float, str, bool]:
+        try:
+            return cls.RELATION_RECORDS[cls.ELEMENT_INDEX[element1]][cls.ELEMENT_INDEX[element2]]
+        except KeyError:
+            raise ValueError("Invalid elements") from None
+
     def get_relation(self, element1: str, element2: str) -> Dict:
-        """分析两个五行之间的关系"""
-        if element1 not in self.ELEMENTS or element2 not in self.ELEMENTS:
-            raise ValueError("Invalid elements")
-            
-        # 检查各种关系
-        relation_type = None
-        for rel_type, rel_map in self.RELATIONS.items():
-            if rel_map[element1] == element2:
-                relation_type = rel_type
-                break
-                
-        # 计算关系强度
-        strength = self.get_relationship_strength(element1, element2)
-        
+        """分析两个五行之间的关系（查关系矩阵）"""
+        relation_type, strength, description, favorable = self._relation_record(element1, element2)
         return {
-            "type": relation_type or "同类" if element1 == element2 else "异类",
+            "type": relation_type,
             "strength": strength,
-            "description": self._get_relation_description(relation_type, element1, element2),
-            "favorable": relation_type in ["生", "化"] or element1 == element2
+            "description": description,
+            "favorable": favorable
         }
+
+    @classmethod
+    def relation_type(cls, element1: str, element2: str) -> str:
+        """两个五行之间的关系类型：生、克、泄、化、同类"""
+        return cls._relation_record(element1, element2)[0]
+
+    @classmethod
+    def get_relations(cls, elements1, elements2) -> RelationMatrix:
+        """批量查询关系矩阵
+
+        Args:
+            elements1: 主五行序号数组（按 ELEMENTS）
+            elements2: 客五行序号数组，与 elements1 广播
+        """
+        index1 = np.asarray(elements1, dtype=np.intp)
+        index2 = np.asarray(elements2, dtype=np.intp)
+        return RelationMatrix(*(table[index1, index2] for table in cls.RELATION_MATRIX))
         
     def analyze_relationship_cycle(self, element: str) -> Dict:
         """分析五行的完整关系循环"""
@@ -284,30 +406,8 @@ class FiveElements:
         }
         
     def get_relationship_strength(self, element1: str, element2: str) -> float:
-        """计算两个五行关系的强度 (0-1)"""
-        base_strength = {
-            "生": 0.8,   # 相生关系基础强度
-            "克": 0.6,   # 相克关系基础强度
-            "泄": 0.4,   # 相泄关系基础强度
-            "化": 0.7,   # 相化关系基础强度
-            "同类": 1.0,  # 同类关系基础强度
-            "异类": 0.3   # 异类关系基础强度
-        }
-        
-        # 获取关系类型
-        relation = self.get_relation(element1, element2)
-        strength = base_strength[relation["type"]]
-        
-        # 根据季节调整强度
-        current_season = self.SEASONS[element1]
-        if current_season == self.SEASONS[element2]:
-            strength *= 1.2
-            
-        # 根据方位调整强度
-        if self.DIRECTIONS[element1] == self.DIRECTIONS[element2]:
-            strength *= 1.1
-            
-        return min(1.0, strength)
+        """计算两个五行关系的强度 (0-1)：基础强度按关系类型，同季节、同方位时加强"""
+        return self._relation_record(element1, element2)[1]
         
     def get_relationship_recommendations(self, element1: str, element2: str) -> Dict:
         """根据五行关系提供具体建议"""
@@ -365,18 +465,7 @@ class FiveElements:
         
     def _get_relation_description(self, relation_type: str, element1: str, element2: str) -> str:
         """获取五行关系的描述"""
-        if relation_type == "生":
-            return f"{element1}生{element2}，关系有利，注重滋养"
-        elif relation_type == "克":
-            return f"{element1}克{element2}，关系受制，需要平衡"
-        elif relation_type == "泄":
-            return f"{element1}泄于{element2}，关系消耗，注意补充"
-        elif relation_type == "化":
-            return f"{element1}化为{element2}，关系转化，把握变化"
-        elif element1 == element2:
-            return f"同属{element1}，关系和谐，注重稳定"
-        else:
-            return f"{element1}与{element2}异类，关系疏离，需要协调"
+        return describe_relation(relation_type, element1, element2)
             
     def _analyze_cycles(self, cycles: Dict, element: str) -> Dict:
         """分析五行循环的特点"""
@@ -0,0 +1,102 @@
+"""共享只读记录及其 JSON 序列化
+
+FrozenRecord 不是 dict 子类（否则标准库编码器会直接逐项编码，无法嵌入预先序列化的片段），
+标准库 json.dumps 不能直接编码含 FrozenRecord 的对象。序列化分析报告（含按需计算的
+LazyAnalysis）须使用本模块的 dumps()，Flask 响应已通过 app.AnalysisJSONProvider 使用它。
+"""
+import json
+import re
+import secrets
+from collections.abc import Mapping
+from datetime import date
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# 预先序列化片段的格式：紧凑、不转义非 ASCII 字符、不排序键（与 Flask 响应的格式一致）
+FRAGMENT_FORMAT = {"ensure_ascii": False, "separators": (",", ":")}
+
+class FrozenRecord(Mapping):
+    """只读的共享记录
+
+    导入时构建一次，各处直接共用，不再逐次拼装字典。
+    列表转为元组、嵌套字典转为 FrozenRecord，并预先序列化为 JSON 片段，
+    dumps() 以相同格式输出时直接嵌入片段而不再逐项编码。
+    """
+
+    __slots__ = ("_data", "json_fragment")
+
+    def __init__(self, data: Mapping):
+        self._data = MappingProxyType({key: _freeze(value) for key, value in data.items()})
+        # 片段格式见 FRAGMENT_FORMAT，其他格式输出时不使用片段
+        self.json_fragment: str = json.dumps(_plain(self._data), **FRAGMENT_FORMAT)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        # 与普通字典相同，便于直接嵌入文本报告
+        return repr(_plain(self._data))
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, FrozenRecord):
+        return value
+    if isinstance(value, Mapping):
+        return FrozenRecord(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _plain(value: Any) -> Any:
+    """转换为 json 可直接编码的普通对象"""
+    if isinstance(value, Mapping):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_plain(item) for item in value]
+    return value
+
+def _uses_fragment_format(kwargs: Dict[str, Any]) -> bool:
+    """json.dumps 参数给出的输出格式是否与片段一致"""
+    return (
+        kwargs.get("ensure_ascii", True) is False
+        and tuple(kwargs.get("separators") or ()) == FRAGMENT_FORMAT["separators"]
+        and not kwargs.get("sort_keys", False)
+        and kwargs.get("indent") is None
+    )
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None, **kwargs) -> str:
+    """序列化分析报告等含 FrozenRecord 的对象为 JSON，其余参数同 json.dumps
+
+    输出格式与片段一致时（FRAGMENT_FORMAT），FrozenRecord 直接嵌入预先序列化的片段：
+    先编码为含本次随机标记的占位字符串，编码完成后一次替换为片段；
+    其他格式（如排序键、转义非 ASCII 字符）按普通字典逐项编码，保证输出格式统一。
+    default 未处理的其他 Mapping（如 LazyAnalysis）按字典编码，日期时间输出为 ISO 格式。
+    """
+    splice = _uses_fragment_format(kwargs)
+    fragments: List[str] = []
+    marker = secrets.token_hex(16) if splice else ""
+
+    def encode(o: Any) -> Any:
+        if isinstance(o, FrozenRecord):
+            if not splice:
+                return _plain(o)
+            fragments.append(o.json_fragment)
+            return f"{marker}:{len(fragments) - 1}"
+        if default is not None:
+            return default(o)
+        if isinstance(o, Mapping):
+            return dict(o)
+        if isinstance(o, date):
+            return o.isoformat()
+        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+    text = json.dumps(obj, default=encode, **kwargs)
+    if not fragments:
+        return text
+    # 标记每次随机生成，普通字符串与之相同的概率可忽略
+    return re.sub(f'"{marker}:(\\d+)"', lambda match: fragments[int(match.group(1))], text)
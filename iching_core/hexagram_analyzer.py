@@ -1,20 +1,79 @@
-from typing import Dict, List, Tuple
+from functools import cached_property
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 from datetime import datetime
-from models.hexagram import Hexagram, HEXAGRAM_DATA, YAO_TEXT
+from models.hexagram import Hexagram, HEXAGRAM_TABLE, YAO_TABLE, TRIGRAM_NAMES, TRIGRAM_INDEX, LINES_TABLE, encode_lines, transform
 from iching_core.five_elements import FiveElements  # 使用绝对导入
+from iching_core.static_analysis import static_section
+from iching_core.analysis_result import LazyAnalysis
+from iching_core.analysis_graph import NodeCache, analysis_graph, analysis_node, check_graph
+from iching_core.time_calculator import day_gan_zhi, season_info
+from iching_core.relationship_analyzer import NAJIA_TABLE, NajiaInfo
+from iching_core.instrumentation import instrumented
+from iching_core.services import FIVE_ELEMENTS as SHARED_FIVE_ELEMENTS
+
+# 纳甲分析场景
+NAJIA_CONTEXTS = ("general", "career", "relationship", "health", "wealth")
+NAJIA_CONTEXT_INDEX = {context: i for i, context in enumerate(NAJIA_CONTEXTS)}
+
+# 六亲在各场景下的含义
+LIUQIN_CONTEXT_MEANINGS = {
+    "兄弟": {"general": "平等、竞争", "career": "竞争对手", "relationship": "情敌", "health": "免疫系统", "wealth": "合作伙伴"},
+    "子孙": {"general": "后代、结果", "career": "技能成果", "relationship": "感情结果", "health": "恢复能力", "wealth": "收益"},
+    "官鬼": {"general": "权威、压力", "career": "上级领导", "relationship": "另一半", "health": "疾病", "wealth": "机遇"},
+    "父母": {"general": "长辈、助力", "career": "资源支持", "relationship": "长辈建议", "health": "调养", "wealth": "本金"},
+    "妻财": {"general": "财运、收获", "career": "报酬收入", "relationship": "感情付出", "health": "营养", "wealth": "财源"}
+}
+
+# 十神在各场景下的含义
+SHISHEN_CONTEXT_MEANINGS = {
+    "正印": {"general": "贵人、学习", "career": "学习提升", "relationship": "精神契合", "health": "调养", "wealth": "稳定增长"},
+    "偏印": {"general": "小人、暗算", "career": "技能特长", "relationship": "精神寄托", "health": "保健", "wealth": "潜在收益"},
+    "正官": {"general": "正统、权威", "career": "正统权威", "relationship": "正缘", "health": "正规治疗", "wealth": "正当收入"},
+    "七杀": {"general": "克制、伤害", "career": "竞争压力", "relationship": "暧昧对象", "health": "急性病症", "wealth": "意外收入"},
+    "正财": {"general": "正财、正当收获", "career": "正当利益", "relationship": "真诚", "health": "营养", "wealth": "固定收入"},
+    "偏财": {"general": "意外之财", "career": "额外收益", "relationship": "暧昧", "health": "补充", "wealth": "机会"},
+    "食神": {"general": "智慧、才艺", "career": "才能", "relationship": "愉悦", "health": "养生", "wealth": "生财之道"},
+    "伤官": {"general": "破坏、创新", "career": "创新能力", "relationship": "浪漫情怀", "health": "亚健康", "wealth": "投机"},
+    "比肩": {"general": "自身、竞争", "career": "同事", "relationship": "朋友", "health": "体魄", "wealth": "共同发展"},
+    "劫财": {"general": "损失、破财", "career": "竞争", "relationship": "干扰", "health": "隐患", "wealth": "消耗"}
+}
+
+# 世应关系在各场景下的性质，按是否有利索引
+SHI_YING_CONTEXT_NATURES = {
+    True: {"general": "彼此呼应", "career": "合作顺利", "relationship": "情投意合", "health": "调理得当", "wealth": "财路通畅"},
+    False: {"general": "彼此牵制", "career": "阻力较大", "relationship": "沟通不畅", "health": "需防反复", "wealth": "求财受阻"}
+}
+
+# 各场景的附加建议
+NAJIA_CONTEXT_ADVICE = {
+    "general": ["综合权衡，顺势而为"],
+    "career": ["明确目标，稳步推进事业"],
+    "relationship": ["真诚沟通，用心维护感情"],
+    "health": ["规律作息，注意调养"],
+    "wealth": ["量入为出，谨慎理财"]
+}
+
+def _compile_context_table(meanings: Dict[str, Dict[str, str]]) -> Tuple[Tuple[str, ...], ...]:
+    """将场景含义编译为 [关系编号][场景编号] 的查找表"""
+    return tuple(
+        tuple(contexts.get(context, "未知") for context in NAJIA_CONTEXTS)
+        for contexts in meanings.values()
+    )
+
+LIUQIN_NAMES = tuple(LIUQIN_CONTEXT_MEANINGS)
+LIUQIN_INDEX = {name: i for i, name in enumerate(LIUQIN_NAMES)}
+LIUQIN_CONTEXT_TABLE = _compile_context_table(LIUQIN_CONTEXT_MEANINGS)
+SHISHEN_NAMES = tuple(SHISHEN_CONTEXT_MEANINGS)
+SHISHEN_INDEX = {name: i for i, name in enumerate(SHISHEN_NAMES)}
+SHISHEN_CONTEXT_TABLE = _compile_context_table(SHISHEN_CONTEXT_MEANINGS)
+SHI_YING_CONTEXT_TABLE = {
+    favorable: tuple(natures[context] for context in NAJIA_CONTEXTS)
+    for favorable, natures in SHI_YING_CONTEXT_NATURES.items()
+}
 
 class HexagramAnalyzer:
     """卦象分析类"""
     
-    # 五行属性
-    FIVE_ELEMENTS = {
-        "金": ["兑", "乾"],
-        "木": ["震", "巽"],
-        "水": ["坎"],
-        "火": ["离"],
-        "土": ["坤", "艮"]
-    }
-    
     # 五行生克关系
     FIVE_ELEMENTS_RELATIONS = {
         "生": {
@@ -66,22 +125,86 @@ class HexagramAnalyzer:
         "劫财": {"nature": "凶", "meaning": "损失、破财"}
     }
 
-    def __init__(self, hexagram: Hexagram):
+    # 爻位（0-5）的重要程度：五爻君位最重，二爻得中次之
+    POSITION_SIGNIFICANCE = (0.6, 0.8, 0.7, 0.7, 1.0, 0.5)
+
+    # 进程内共享的五行服务
+    five_elements: FiveElements = SHARED_FIVE_ELEMENTS
+
+    # 分析报告各段及其计算方法
+    ANALYSIS_SECTIONS = {
+        "basic_info": "_get_basic_info",
+        "hexagram_info": "_get_hexagram_info",
+        "yao_layout": "_get_yao_layout",
+        "relationships": "_get_relationships",
+        "recommendations": "_get_recommendations"
+    }
+
+    def __init__(self, hexagram: Hexagram, use_static: bool = True):
+        """
+        Args:
+            hexagram: 卦象
+            use_static: 是否从静态分析数据包查表（构建数据包时关闭）
+        """
         self.hexagram = hexagram
-        self.hexagram_data = HEXAGRAM_DATA.get(f"{hexagram.original_trigrams[0]}_{hexagram.original_trigrams[1]}", {})
-        self.yao_text = YAO_TEXT.get(f"{hexagram.original_trigrams[0]}_{hexagram.original_trigrams[1]}", {})
-        self.five_elements = FiveElements()
+        self.use_static = use_static
+        self._nodes = NodeCache()
 
-    def generate_analysis(self) -> Dict:
-        """生成完整分析报告"""
+    @staticmethod
+    @instrumented()
+    def analyze_many(codes, masks, times) -> "BatchAnalysis":
+        """批量计算数值部分（各爻力量、五行平衡与有利度、趋势指标、可信度），不生成文字
+
+        Args:
+            codes: 本卦编码数组
+            masks: 动爻掩码数组
+            times: 起卦时间数组（或单个时间）
+        """
+        from iching_core.batch_analysis import analyze_many
+        return analyze_many(codes, masks, times)
+
+    def score(self) -> "AnalysisScore":
+        """本卦的数值评分（有利度、趋势指标、可信度），不生成文字，供大批量排序筛选"""
+        from iching_core.batch_analysis import score
+        return score(self.hexagram.code, self.hexagram.mask, self.hexagram.time)
+
+    @classmethod
+    def analysis_graph(cls) -> Dict[str, Tuple[str, ...]]:
+        """分析依赖图：节点名 -> 所依赖的节点名"""
+        return analysis_graph(cls)
+
+    def node_profile(self) -> Dict[str, Dict[str, float]]:
+        """本实例已计算节点的耗时（秒），按自身耗时从高到低排列"""
+        timings = sorted(self._nodes.timings.items(), key=lambda item: item[1][1], reverse=True)
         return {
-            "basic_info": self._get_basic_info(),
-            "hexagram_info": self._get_hexagram_info(),
-            "yao_layout": self._get_yao_layout(),
-            "relationships": self._get_relationships(),
-            "recommendations": self._get_recommendations()
+            name: {"total": total, "self": own, "depends": list(self.analysis_graph()[name])}
+            for name, (total, own) in timings
         }
 
+    @cached_property
+    def hexagram_data(self) -> Mapping[str, str]:
+        """本卦卦辞信息（只读取本卦所在分片）"""
+        return HEXAGRAM_TABLE[self.hexagram.code]
+
+    @property
+    def yao_text(self) -> Mapping[int, str]:
+        """本卦爻辞（只读取本卦所在分片）"""
+        return YAO_TABLE[self.hexagram.code]
+
+    @property
+    def najia(self) -> NajiaInfo:
+        """纳甲装卦结果（宫位、世代、世应、干支、六亲、伏神）"""
+        return NAJIA_TABLE[self.hexagram.code]
+
+    def generate_analysis(self, sections: Optional[Iterable[str]] = None) -> LazyAnalysis:
+        """生成分析报告（各段在首次访问时计算）
+
+        Args:
+            sections: 需要的段，缺省为全部，可选值见 ANALYSIS_SECTIONS
+        """
+        return LazyAnalysis(self, sections)
+
+    @analysis_node()
     def _get_basic_info(self) -> Dict:
         """获取基础信息"""
         return {
@@ -96,6 +219,7 @@ class HexagramAnalyzer:
         # TODO: 实现完整的干支计算
         return "甲子日 戊午时"
 
+    @analysis_node("_get_yao_text")
     def _get_hexagram_info(self) -> Dict:
         """获取卦象信息"""
         original_name = f"{self.hexagram_data.get('name', '')}"
@@ -112,13 +236,15 @@ class HexagramAnalyzer:
             "changed_explanation": self._get_changed_explanation()
         }
 
+    @analysis_node()
     def _get_yao_text(self) -> Dict:
         """获取爻辞"""
         result = {}
+        yao_text = self.yao_text
         for line_num, line in enumerate(self.hexagram.lines, start=1):
             key = f"line_{line_num}"
-            text = self.yao_text.get(str(line_num), "")
-            changing = line_num in self.hexagram.changing_lines
+            text = yao_text.get(line_num, "")
+            changing = self._is_changing(line_num)
             result[key] = {
                 "text": text,
                 "changing": changing,
@@ -135,34 +261,40 @@ class HexagramAnalyzer:
 
     def _get_changed_hexagram_name(self) -> str:
         """获取变卦名称"""
-        if not self.hexagram.changing_lines:
+        if not self.hexagram.mask:
             return ""
-        changed_key = f"{self.hexagram.changed_trigrams[0]}_{self.hexagram.changed_trigrams[1]}"
-        changed_data = HEXAGRAM_DATA.get(changed_key, {})
-        return changed_data.get("name", "")
+        return HEXAGRAM_TABLE[self.hexagram.changed_code].get("name", "")
 
     def _get_changed_explanation(self) -> str:
         """获取变卦解释"""
-        if not self.hexagram.changing_lines:
+        if not self.hexagram.mask:
             return ""
-        changed_key = f"{self.hexagram.changed_trigrams[0]}_{self.hexagram.changed_trigrams[1]}"
-        changed_data = HEXAGRAM_DATA.get(changed_key, {})
-        return changed_data.get("nature", "")
+        return HEXAGRAM_TABLE[self.hexagram.changed_code].get("nature", "")
+
+    def _is_changing(self, position: int) -> bool:
+        """判断爻位（1-6）是否为动爻"""
+        return bool(self.hexagram.mask >> (position - 1) & 1)
 
+    @analysis_node("_get_shi_ying", "_get_dynamic_analysis")
+    @static_section("yao_layout")
     def _get_yao_layout(self) -> Dict:
         """获取爻位排布"""
         layout = {}
         for position, line in enumerate(self.hexagram.lines, start=1):
             layout[f"line_{position}"] = {
                 "value": line,
-                "changing": position in self.hexagram.changing_lines,
+                "changing": self._is_changing(position),
                 "position_nature": self._get_position_nature(position),
                 "element": self._get_line_element(position),
+                "gan_zhi": self.najia.gan_zhi[position - 1],
+                "relative": self.najia.relatives[position - 1],
                 "dynamic": self._get_line_dynamic(position, line)
             }
         
         return {
             "gong": self.hexagram.gong,
+            "generation": self.najia.generation,
+            "fu_shen": [fu_shen._asdict() for fu_shen in self.najia.fu_shen],
             "lines": layout,
             "shi_ying": self._get_shi_ying(),
             "dynamic_analysis": self._get_dynamic_analysis()
@@ -170,7 +302,7 @@ class HexagramAnalyzer:
 
     def _get_line_dynamic(self, position: int, line: int) -> Dict:
         """获取爻的动态特征"""
-        is_changing = position in self.hexagram.changing_lines
+        is_changing = self._is_changing(position)
         position_nature = self._get_position_nature(position)
         line_nature = "阳" if line == 1 else "阴"
         
@@ -230,6 +362,8 @@ class HexagramAnalyzer:
         }
         return descriptions.get(level, "影响力未知")
 
+    @analysis_node()
+    @static_section("dynamic_analysis")
     def _get_dynamic_analysis(self) -> Dict:
         """分析卦象整体动态"""
         changing_count = len(self.hexagram.changing_lines)
@@ -281,6 +415,7 @@ class HexagramAnalyzer:
                 "寻求稳定支持"
             ]
 
+    @analysis_node("_analyze_shi_yao", "_analyze_ying_yao", "_analyze_liu_qin", "_analyze_wu_xing", "_analyze_shi_shen")
     def _get_relationships(self) -> Dict:
         """获取关系分析"""
         return {
@@ -291,6 +426,7 @@ class HexagramAnalyzer:
             "shi_shen": self._analyze_shi_shen()
         }
 
+    @analysis_node("_get_short_term_advice", "_get_medium_term_advice", "_get_long_term_advice", "_get_risk_advice")
     def _get_recommendations(self) -> Dict:
         """获取建议"""
         return {
@@ -300,12 +436,110 @@ class HexagramAnalyzer:
             "risks": self._get_risk_advice()
         }
 
+    @analysis_node("_get_shi_ying")
+    def _analyze_ying_yao(self) -> Dict:
+        """分析应爻特征"""
+        shi_ying = self._get_shi_ying()
+        ying_position = shi_ying["ying"]
+        shi_value = self.hexagram.lines[shi_ying["shi"] - 1]
+
+        line_value = self.hexagram.lines[ying_position - 1]
+        is_changing = self._is_changing(ying_position)
+        position_nature = self._get_position_nature(ying_position)
+        line_nature = "阳" if line_value == 1 else "阴"
+
+        return {
+            "position": ying_position,
+            "value": line_value,
+            "changing": is_changing,
+            "position_nature": position_nature,
+            "line_nature": line_nature,
+            "harmony": line_nature == position_nature.replace("位", ""),
+            "strength": self._get_line_strength(ying_position, line_value, is_changing),
+            "element": self._get_line_element(ying_position),
+            # 世应一阴一阳为有应
+            "responds_to_shi": line_value != shi_value
+        }
+
+    @analysis_node()
+    def _analyze_liu_qin(self) -> List[Dict]:
+        """分析六亲分布"""
+        return [
+            {
+                "position": position,
+                "relative": relative,
+                "info": self.SIX_RELATIVES.get(relative, {}),
+                "changing": self._is_changing(position)
+            }
+            for position, relative in enumerate(self.hexagram.six_relatives, start=1)
+        ]
+
+    @analysis_node()
+    def _analyze_shi_shen(self) -> Dict:
+        """分析十神（需要日干，缺失时返回空）"""
+        if self.hexagram.celestial_stem not in self.five_elements.NAJIA:
+            return {}
+        return self.analyze_ten_gods()
+
+    @analysis_node("_analyze_shi_yao")
+    def _get_short_term_advice(self) -> List[str]:
+        """近期建议：取决于世爻状态"""
+        return self._analyze_shi_yao()["advice"]
+
+    @analysis_node()
+    def _get_medium_term_advice(self) -> List[str]:
+        """中期建议：取决于动爻在内外卦的分布"""
+        positions = self.hexagram.changing_lines
+        if not positions:
+            return ["中期形势平稳，按既定计划推进"]
+
+        advice = []
+        if any(pos < 3 for pos in positions):
+            advice.append("内卦有变，自身状况将有调整，宜先修内功")
+        if any(pos >= 3 for pos in positions):
+            advice.append("外卦有变，外部环境将有变化，宜留意时势")
+        return advice
+
+    @analysis_node()
+    def _get_long_term_advice(self) -> List[str]:
+        """长期建议：取决于变卦"""
+        if not self.hexagram.mask:
+            name = self.hexagram_data.get("name", "")
+            nature = self.hexagram_data.get("nature", "")
+            return [f"长期仍守{name}卦之道：{nature}"]
+        return [f"事态将趋向{self._get_changed_hexagram_name()}卦：{self._get_changed_explanation()}"]
+
+    @analysis_node("_get_shi_ying", "_analyze_shi_yao")
+    def _get_risk_advice(self) -> Dict:
+        """风险评估"""
+        risks = []
+        shi_ying = self._get_shi_ying()
+        if len(self.hexagram.changing_lines) >= 3:
+            risks.append("变化剧烈，防范局面失控")
+        if self._is_changing(shi_ying["shi"]):
+            risks.append("世爻发动，防范自身决策失误")
+        if self._is_changing(shi_ying["ying"]):
+            risks.append("应爻发动，注意对方或环境的变化")
+        if not self._analyze_shi_yao()["harmony"]:
+            risks.append("世爻失正，避免冒进")
+        if len(risks) >= 3:
+            level = "高"
+        elif risks:
+            level = "中"
+        else:
+            level = "低"
+        return {
+            "level": level,
+            "description": "；".join(risks) or "暂无明显风险，注意保持"
+        }
+
+    @instrumented()
     def analyze_five_elements(self) -> Dict:
         """分析卦象的五行属性和关系"""
-        upper_trigram = self.hexagram.upper_trigram
-        lower_trigram = self.hexagram.lower_trigram
-        upper_element = self._get_element(upper_trigram)
-        lower_element = self._get_element(lower_trigram)
+        upper_trigram = self._get_upper_trigram_name()
+        lower_trigram = self._get_lower_trigram_name()
+        upper_element = self.five_elements.TRIGRAM_ELEMENT_TABLE[self.hexagram.code >> 3]
+        lower_element = self.five_elements.TRIGRAM_ELEMENT_TABLE[self.hexagram.code & 7]
 
         # 获取卦的时间五行
         time_element = self.five_elements.NAJIA[self.hexagram.celestial_stem]
@@ -344,6 +578,7 @@ class HexagramAnalyzer:
             )
         }
 
+    @instrumented()
     def analyze_changing_lines(self) -> List[Dict]:
         """分析动爻的含义和影响"""
         results = []
@@ -359,6 +594,7 @@ class HexagramAnalyzer:
             results.append(line_analysis)
         return results
 
+    @instrumented()
     def analyze_six_relatives(self) -> List[Dict]:
         """分析六亲关系"""
         results = []
@@ -372,6 +608,7 @@ class HexagramAnalyzer:
             results.append(result)
         return results
 
+    @instrumented()
     def analyze_six_spirits(self) -> List[Dict]:
         """分析六神关系"""
         results = []
@@ -385,6 +622,7 @@ class HexagramAnalyzer:
             results.append(result)
         return results
 
+    @instrumented()
     def analyze_ten_gods(self) -> Dict:
         """分析十神关系"""
         stem = self.hexagram.celestial_stem
@@ -397,7 +635,7 @@ class HexagramAnalyzer:
         results = []
         for position, line in enumerate(self.hexagram.lines):
             # 根据爻的阴阳和五行确定十神
-            line_element = self._get_line_element(position)
+            line_element = self._get_line_element(position + 1)
             god = self._determine_ten_god(day_master, line_element, line == 1)
             
             result = {
@@ -413,6 +651,7 @@ class HexagramAnalyzer:
             "positions": results
         }
 
+    @instrumented()
     def analyze_najia_relationships(self, context_type: str = "general") -> Dict:
         """分析六爻纳甲关系
         
@@ -424,257 +663,212 @@ class HexagramAnalyzer:
                 - health: 健康
                 - wealth: 财运
         """
+        return self.analyze_najia_contexts([context_type])[context_type]
+
+    @instrumented()
+    def analyze_najia_contexts(self, contexts: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """一次分析多个场景的纳甲关系
+
+        世应、六亲、十神与变爻只计算一次，各场景只做含义表查询。
+
+        Args:
+            contexts: 场景列表，缺省为 NAJIA_CONTEXTS 全部场景
+        """
+        contexts = NAJIA_CONTEXTS if contexts is None else tuple(contexts)
+        for context_type in contexts:
+            if context_type not in NAJIA_CONTEXT_INDEX:
+                raise ValueError(f"Invalid context type: {context_type}")
+
+        core = self._get_najia_core()
+        reports = {}
+        for context_type in contexts:
+            context = NAJIA_CONTEXT_INDEX[context_type]
+
+            # 分析世应爻关系
+            shi_ying_relation = self._analyze_shi_ying_relation(core, context)
+
+            # 分析六亲、十神关系
+            liuqin_relations = self._analyze_liuqin_relations(core, context)
+            shishen_relations = self._analyze_shishen_relations(core, context)
+
+            # 生成综合分析
+            comprehensive_analysis = self._generate_najia_analysis(core, shi_ying_relation, context)
+
+            reports[context_type] = {
+                "shi_ying_relation": shi_ying_relation,
+                "liuqin_relations": liuqin_relations,
+                "shishen_relations": shishen_relations,
+                "comprehensive_analysis": comprehensive_analysis
+            }
+        return reports
+
+    @analysis_node("_get_shi_ying", "_get_changed_lines")
+    def _get_najia_core(self) -> Dict:
+        """纳甲分析中与场景无关的部分"""
         # 获取世应爻位置
         shi_yao = self._get_shi_yao_position()
         ying_yao = self._get_ying_yao_position()
-        
+
         # 获取本卦和变卦信息
-        original_lines = self.hexagram.lines
-        changing_positions = self.hexagram.changing_lines
-        changed_lines = original_lines.copy()
-        for pos in changing_positions:
-            changed_lines[pos] = 1 if original_lines[pos] == 0 else 0
-            
-        # 分析世应爻关系
-        shi_ying_relation = self._analyze_shi_ying_relation(
-            shi_yao,
-            ying_yao,
-            original_lines,
-            context_type
-        )
-        
-        # 分析六亲关系
-        liuqin_relations = self._analyze_liuqin_relations(
-            original_lines,
-            changed_lines,
-            context_type
-        )
-        
-        # 分析十神关系
-        shishen_relations = self._analyze_shishen_relations(
-            original_lines,
-            changed_lines,
-            context_type
-        )
-        
-        # 生成综合分析
-        comprehensive_analysis = self._generate_najia_analysis(
-            shi_ying_relation,
-            liuqin_relations,
-            shishen_relations,
-            context_type
+        original = self.hexagram.lines
+        changed = self._get_changed_lines()
+
+        # 世应爻关系与五行
+        basic_relation = self._get_yao_relation(original[shi_yao], original[ying_yao])
+        element_relation = self._analyze_element_relation(
+            self._get_yao_element(shi_yao, original[shi_yao]),
+            self._get_yao_element(ying_yao, original[ying_yao])
         )
-        
+
+        # 各爻六亲、十神编号
+        liuqin_ids = [LIUQIN_INDEX[self._get_liuqin_type(pos, original[pos])] for pos in range(6)]
+        shishen_ids = [SHISHEN_INDEX[self._get_shishen_type(pos, original[pos])] for pos in range(6)]
+        significance = [self._get_position_significance(pos) for pos in range(6)]
+
+        # 变爻的变化关系
+        liuqin_changes = [None] * 6
+        shishen_changes = [None] * 6
+        for pos in self.hexagram.changing_lines:
+            liuqin_changes[pos] = self._analyze_change_relation(original[pos], changed[pos], LIUQIN_NAMES[liuqin_ids[pos]])
+            shishen_changes[pos] = self._analyze_change_relation(original[pos], changed[pos], SHISHEN_NAMES[shishen_ids[pos]])
+
         return {
-            "shi_ying_relation": shi_ying_relation,
-            "liuqin_relations": liuqin_relations,
-            "shishen_relations": shishen_relations,
-            "comprehensive_analysis": comprehensive_analysis
+            "shi": shi_yao,
+            "ying": ying_yao,
+            "basic_relation": basic_relation,
+            "element_relation": element_relation,
+            "strength": self._calculate_relation_strength(basic_relation, element_relation),
+            "liuqin_ids": liuqin_ids,
+            "shishen_ids": shishen_ids,
+            "liuqin_changes": liuqin_changes,
+            "shishen_changes": shishen_changes,
+            "significance": significance,
+            "liuqin_influences": self._rank_influences(liuqin_ids, significance),
+            "shishen_influences": self._rank_influences(shishen_ids, significance)
         }
 
+    @analysis_node()
+    def _get_changed_lines(self) -> List[int]:
+        """查变卦转换表得到变卦六爻"""
+        changed_code = transform(self.hexagram.code, self.hexagram.mask).changed_code
+        return list(LINES_TABLE[changed_code])
+
     def _get_shi_yao_position(self) -> int:
-        """获取世爻位置"""
-        # 根据卦宫和动静来确定世爻
-        # 此处需要补充具体的世爻判断逻辑
-        return 0  # 临时返回值
+        """获取世爻位置（0-5）"""
+        return self._get_shi_ying()["shi"] - 1
 
     def _get_ying_yao_position(self) -> int:
-        """获取应爻位置"""
-        # 应爻与世爻相对
-        shi_yao = self._get_shi_yao_position()
-        return 5 - shi_yao
+        """获取应爻位置（0-5）"""
+        return self._get_shi_ying()["ying"] - 1
+
+    def _get_yao_relation(self, shi_line: int, ying_line: int) -> str:
+        """世应阴阳关系：一阴一阳为相应"""
+        return "阴阳相应" if shi_line != ying_line else "同性不应"
+
+    def _get_yao_element(self, position: int, line: int) -> str:
+        """获取爻（0-5）的五行"""
+        return self._get_line_element(position + 1)
+
+    def _analyze_element_relation(self, element1: str, element2: str) -> Dict:
+        """分析世应五行关系"""
+        relation = self.five_elements.get_relation(element1, element2)
+        relation["elements"] = (element1, element2)
+        return relation
+
+    def _calculate_relation_strength(self, basic_relation: str, element_relation: Dict) -> float:
+        """世应关系强度：五行关系强度，相应时加强"""
+        strength = element_relation["strength"]
+        if basic_relation == "阴阳相应":
+            strength += 0.2
+        return round(min(1.0, strength), 2)
+
+    def _get_liuqin_type(self, position: int, line: int) -> str:
+        """获取爻（0-5）的六亲"""
+        return self.najia.relatives[position]
+
+    def _get_day_master(self) -> str:
+        """日主五行（日干五行，卦象未记录日干时按起卦日推算）"""
+        stem = self.hexagram.celestial_stem or day_gan_zhi(self.hexagram.time)[0]
+        return self.five_elements.NAJIA[stem]
+
+    def _get_shishen_type(self, position: int, line: int) -> str:
+        """获取爻（0-5）的十神"""
+        return self._determine_ten_god(self._get_day_master(), self._get_yao_element(position, line), line == 1)
+
+    def _analyze_change_relation(self, original: int, changed: int, relation_name: str) -> Dict:
+        """分析变爻的阴阳变化"""
+        original_nature = "阳" if original == 1 else "阴"
+        changed_nature = "阳" if changed == 1 else "阴"
+        return {
+            "from": original_nature,
+            "to": changed_nature,
+            "description": f"{relation_name}爻由{original_nature}变{changed_nature}"
+        }
+
+    def _rank_influences(self, relation_ids: List[int], significance: List[float]) -> List[Tuple[int, float]]:
+        """按爻位重要程度汇总各关系的影响，取前两位"""
+        influence_stats: Dict[int, float] = {}
+        for relation_id, weight in zip(relation_ids, significance):
+            influence_stats[relation_id] = influence_stats.get(relation_id, 0) + weight
+        ranked = sorted(influence_stats.items(), key=lambda x: x[1], reverse=True)[:2]
+        return [(relation_id, round(weight, 2)) for relation_id, weight in ranked]
 
-    def _analyze_shi_ying_relation(self, shi_yao: int, ying_yao: int, 
-                                 lines: List[int], context_type: str) -> Dict:
+    def _analyze_shi_ying_relation(self, core: Dict, context: int) -> Dict:
         """分析世应爻关系"""
-        # 基本关系判断
-        basic_relation = self._get_yao_relation(
-            lines[shi_yao],
-            lines[ying_yao]
-        )
-        
-        # 获取世应爻五行属性
-        shi_element = self._get_yao_element(shi_yao, lines[shi_yao])
-        ying_element = self._get_yao_element(ying_yao, lines[ying_yao])
-        
-        # 分析五行关系
-        element_relation = self._analyze_element_relation(
-            shi_element,
-            ying_element
-        )
-        
-        # 根据场景调整关系解释
-        context_meaning = self._get_context_specific_meaning(
-            basic_relation,
-            element_relation,
-            context_type
-        )
-        
+        favorable = core["element_relation"]["favorable"]
         return {
-            "basic_relation": basic_relation,
-            "element_relation": element_relation,
-            "context_meaning": context_meaning,
-            "strength": self._calculate_relation_strength(
-                basic_relation,
-                element_relation
-            )
+            "basic_relation": core["basic_relation"],
+            "element_relation": core["element_relation"],
+            "context_meaning": {
+                "favorable": favorable,
+                "nature": SHI_YING_CONTEXT_TABLE[favorable][context]
+            },
+            "strength": core["strength"]
         }
 
-    def _analyze_liuqin_relations(self, original: List[int], 
-                                changed: List[int], context_type: str) -> List[Dict]:
+    def _analyze_liuqin_relations(self, core: Dict, context: int) -> List[Dict]:
         """分析六亲关系"""
-        relations = []
-        
-        # 六亲属性定义
-        liuqin_types = {
-            "兄弟": {"career": "竞争对手", "relationship": "情敌", "health": "免疫系统", "wealth": "合作伙伴"},
-            "子孙": {"career": "技能成果", "relationship": "感情结果", "health": "恢复能力", "wealth": "收益"},
-            "官鬼": {"career": "上级领导", "relationship": "另一半", "health": "疾病", "wealth": "机遇"},
-            "父母": {"career": "资源支持", "relationship": "长辈建议", "health": "调养", "wealth": "本金"},
-            "妻财": {"career": "报酬收入", "relationship": "感情付出", "health": "营养", "wealth": "财源"}
-        }
-        
-        for pos in range(6):
-            # 获取该爻的六亲属性
-            liuqin = self._get_liuqin_type(pos, original[pos])
-            
-            # 分析原卦与变卦的关系
-            if pos in self.hexagram.changing_lines:
-                change_relation = self._analyze_change_relation(
-                    original[pos],
-                    changed[pos],
-                    liuqin
-                )
-            else:
-                change_relation = None
-            
-            # 获取场景特定含义
-            context_meaning = liuqin_types.get(liuqin, {}).get(context_type, "未知")
-            
-            relations.append({
+        return [
+            {
                 "position": pos,
-                "liuqin": liuqin,
-                "context_meaning": context_meaning,
-                "change_relation": change_relation,
-                "significance": self._get_position_significance(pos)
-            })
-            
-        return relations
+                "liuqin": LIUQIN_NAMES[liuqin_id],
+                "context_meaning": LIUQIN_CONTEXT_TABLE[liuqin_id][context],
+                "change_relation": core["liuqin_changes"][pos],
+                "significance": core["significance"][pos]
+            }
+            for pos, liuqin_id in enumerate(core["liuqin_ids"])
+        ]
 
-    def _analyze_shishen_relations(self, original: List[int], 
-                                 changed: List[int], context_type: str) -> List[Dict]:
+    def _analyze_shishen_relations(self, core: Dict, context: int) -> List[Dict]:
         """分析十神关系"""
-        relations = []
-        
-        # 十神属性定义
-        shishen_types = {
-            "正官": {
-                "career": "正统权威",
-                "relationship": "正缘",
-                "health": "正规治疗",
-                "wealth": "正当收入"
-            },
-            "七杀": {
-                "career": "竞争压力",
-                "relationship": "暧昧对象",
-                "health": "急性病症",
-                "wealth": "意外收入"
-            },
-            "正印": {
-                "career": "学习提升",
-                "relationship": "精神契合",
-                "health": "调养",
-                "wealth": "稳定增长"
-            },
-            "偏印": {
-                "career": "技能特长",
-                "relationship": "精神寄托",
-                "health": "保健",
-                "wealth": "潜在收益"
-            },
-            "比肩": {
-                "career": "同事",
-                "relationship": "朋友",
-                "health": "体魄",
-                "wealth": "共同发展"
-            },
-            "劫财": {
-                "career": "竞争",
-                "relationship": "干扰",
-                "health": "隐患",
-                "wealth": "消耗"
-            },
-            "伤官": {
-                "career": "创新能力",
-                "relationship": "浪漫情怀",
-                "health": "亚健康",
-                "wealth": "投机"
-            },
-            "食神": {
-                "career": "才能",
-                "relationship": "愉悦",
-                "health": "养生",
-                "wealth": "生财之道"
-            },
-            "正财": {
-                "career": "正当利益",
-                "relationship": "真诚",
-                "health": "营养",
-                "wealth": "固定收入"
-            },
-            "偏财": {
-                "career": "额外收益",
-                "relationship": "暧昧",
-                "health": "补充",
-                "wealth": "机会"
-            }
-        }
-        
-        for pos in range(6):
-            # 获取该爻的十神属性
-            shishen = self._get_shishen_type(pos, original[pos])
-            
-            # 分析原卦与变卦的关系
-            if pos in self.hexagram.changing_lines:
-                change_relation = self._analyze_change_relation(
-                    original[pos],
-                    changed[pos],
-                    shishen
-                )
-            else:
-                change_relation = None
-            
-            # 获取场景特定含义
-            context_meaning = shishen_types.get(shishen, {}).get(context_type, "未知")
-            
-            relations.append({
+        return [
+            {
                 "position": pos,
-                "shishen": shishen,
-                "context_meaning": context_meaning,
-                "change_relation": change_relation,
-                "significance": self._get_position_significance(pos)
-            })
-            
-        return relations
+                "shishen": SHISHEN_NAMES[shishen_id],
+                "context_meaning": SHISHEN_CONTEXT_TABLE[shishen_id][context],
+                "change_relation": core["shishen_changes"][pos],
+                "significance": core["significance"][pos]
+            }
+            for pos, shishen_id in enumerate(core["shishen_ids"])
+        ]
 
-    def _generate_najia_analysis(self, shi_ying: Dict, liuqin: List[Dict],
-                               shishen: List[Dict], context_type: str) -> Dict:
+    def _generate_najia_analysis(self, core: Dict, shi_ying: Dict, context: int) -> Dict:
         """生成纳甲综合分析"""
         # 分析世应关系的影响
-        shi_ying_impact = self._analyze_shi_ying_impact(shi_ying, context_type)
+        shi_ying_impact = self._analyze_shi_ying_impact(shi_ying)
         
         # 分析六亲关系的整体态势
-        liuqin_trend = self._analyze_liuqin_trend(liuqin, context_type)
+        liuqin_trend = self._analyze_liuqin_trend(core, context)
         
         # 分析十神关系的关键指向
-        shishen_indication = self._analyze_shishen_indication(shishen, context_type)
+        shishen_indication = self._analyze_shishen_indication(core, context)
         
         # 生成具体建议
         recommendations = self._generate_najia_recommendations(
             shi_ying_impact,
             liuqin_trend,
             shishen_indication,
-            context_type
+            context
         )
         
         return {
@@ -684,7 +878,7 @@ class HexagramAnalyzer:
             "recommendations": recommendations
         }
 
-    def _analyze_shi_ying_impact(self, shi_ying: Dict, context_type: str) -> Dict:
+    def _analyze_shi_ying_impact(self, shi_ying: Dict) -> Dict:
         """分析世应关系的影响"""
         # 基于关系强度和场景特点评估影响
         strength = shi_ying["strength"]
@@ -706,64 +900,32 @@ class HexagramAnalyzer:
             "suggestion": suggestion
         }
 
-    def _analyze_liuqin_trend(self, liuqin: List[Dict], context_type: str) -> Dict:
+    def _analyze_liuqin_trend(self, core: Dict, context: int) -> Dict:
         """分析六亲关系的整体态势"""
-        # 统计各类六亲的影响
-        influence_stats = {}
-        for relation in liuqin:
-            liuqin_type = relation["liuqin"]
-            significance = relation["significance"]
-            
-            if liuqin_type not in influence_stats:
-                influence_stats[liuqin_type] = 0
-            influence_stats[liuqin_type] += significance
-            
-        # 找出主要影响力量
-        main_influences = sorted(
-            influence_stats.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:2]
-        
+        main_influences = core["liuqin_influences"]
         return {
-            "main_influences": main_influences,
-            "trend_description": self._get_liuqin_trend_description(
-                main_influences,
-                context_type
-            )
+            "main_influences": [(LIUQIN_NAMES[liuqin_id], weight) for liuqin_id, weight in main_influences],
+            "trend_description": "、".join(
+                f"{LIUQIN_NAMES[liuqin_id]}（{LIUQIN_CONTEXT_TABLE[liuqin_id][context]}）"
+                for liuqin_id, _ in main_influences
+            ) + "影响最大"
         }
 
-    def _analyze_shishen_indication(self, shishen: List[Dict], context_type: str) -> Dict:
+    def _analyze_shishen_indication(self, core: Dict, context: int) -> Dict:
         """分析十神关系的关键指向"""
-        # 统计各类十神的影响
-        influence_stats = {}
-        for relation in shishen:
-            shishen_type = relation["shishen"]
-            significance = relation["significance"]
-            
-            if shishen_type not in influence_stats:
-                influence_stats[shishen_type] = 0
-            influence_stats[shishen_type] += significance
-            
-        # 找出关键指向
-        key_indications = sorted(
-            influence_stats.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:2]
-        
+        key_indications = core["shishen_influences"]
         return {
-            "key_indications": key_indications,
-            "indication_meaning": self._get_shishen_indication_meaning(
-                key_indications,
-                context_type
-            )
+            "key_indications": [(SHISHEN_NAMES[shishen_id], weight) for shishen_id, weight in key_indications],
+            "indication_meaning": "、".join(
+                f"{SHISHEN_NAMES[shishen_id]}（{SHISHEN_CONTEXT_TABLE[shishen_id][context]}）"
+                for shishen_id, _ in key_indications
+            ) + "为关键"
         }
 
     def _generate_najia_recommendations(self, shi_ying_impact: Dict,
                                       liuqin_trend: Dict,
                                       shishen_indication: Dict,
-                                      context_type: str) -> List[str]:
+                                      context: int) -> List[str]:
         """生成纳甲分析建议"""
         recommendations = []
         
@@ -783,22 +945,24 @@ class HexagramAnalyzer:
         )
         
         # 添加场景特定建议
-        context_specific = self._get_context_specific_recommendations(
-            context_type,
-            shi_ying_impact,
-            liuqin_trend,
-            shishen_indication
-        )
-        recommendations.extend(context_specific)
+        recommendations.extend(NAJIA_CONTEXT_ADVICE[NAJIA_CONTEXTS[context]])
         
         return recommendations
 
     def _get_element(self, trigram: str) -> str:
         """获取卦象的五行属性"""
-        for element, trigrams in self.FIVE_ELEMENTS.items():
-            if trigram in trigrams:
-                return element
-        return "土"  # 默认属土
+        code = TRIGRAM_INDEX.get(trigram)
+        if code is None:
+            return "土"  # 默认属土
+        return self.five_elements.TRIGRAM_ELEMENT_TABLE[code]
+
+    def _get_upper_trigram_name(self) -> str:
+        """获取上卦名"""
+        return TRIGRAM_NAMES[self.hexagram.code >> 3]
+
+    def _get_lower_trigram_name(self) -> str:
+        """获取下卦名"""
+        return TRIGRAM_NAMES[self.hexagram.code & 7]
 
     def _analyze_element_strength(self, upper: str, lower: str, time: str) -> Dict:
         """分析五行力量强弱"""
@@ -869,24 +1033,22 @@ class HexagramAnalyzer:
         }
 
     def _analyze_seasonal_influence(self, time_element: str) -> Dict:
-        """分析五行的季节性影响"""
-        current_season = self._get_current_season()
-        season_element = {
-            "春": "木",
-            "夏": "火",
-            "秋": "金",
-            "冬": "水",
-            "四季": "土"
-        }[current_season]
-        
-        seasonal_relation = self.five_elements.get_relation(season_element, time_element)
+        """按起卦时的节气月令分析五行旺相休囚死"""
+        season = season_info(self.hexagram.time)
+        element_index = self.five_elements.ELEMENT_INDEX[time_element]
+        seasonal_state = season.states[element_index]
         
         return {
-            "current_season": current_season,
-            "season_element": season_element,
+            "current_season": season.season,
+            "solar_term": season.solar_term,
+            "month_branch": season.month_branch,
+            "season_element": season.ruling_element,
             "time_element": time_element,
-            "seasonal_relation": seasonal_relation,
-            "is_seasonally_favorable": seasonal_relation["type"] in ["生", "化"]
+            "seasonal_relation": self.five_elements.get_relation(season.ruling_element, time_element),
+            "seasonal_state": seasonal_state,
+            "seasonal_strength": season.strengths[element_index],
+            "element_states": dict(zip(self.five_elements.ELEMENTS, season.states)),
+            "is_seasonally_favorable": seasonal_state in ("旺", "相")
         }
 
     def _calculate_balance_score(self, element_counts: Dict[str, int]) -> float:
@@ -903,18 +1065,6 @@ class HexagramAnalyzer:
         
         return round(balance_score, 2)
 
-    def _get_current_season(self) -> str:
-        """根据当前月份获取季节"""
-        month = self.hexagram.time.month
-        if month in [3, 4, 5]:
-            return "春"
-        elif month in [6, 7, 8]:
-            return "夏"
-        elif month in [9, 10, 11]:
-            return "秋"
-        else:
-            return "冬"
-
     def _get_overall_element_status(self, strength: Dict, relationships: Dict, seasonal: Dict) -> Dict:
         """综合分析五行状态"""
         # 计算整体有利度分数 (0-100)
@@ -937,7 +1087,7 @@ class HexagramAnalyzer:
         return {
             "favorable_score": round(favorable_score, 1),
             "status_level": self._get_status_level(favorable_score),
-            "primary_recommendations": self._get_recommendations(
+            "primary_recommendations": self._get_element_recommendations(
                 strength["weakest_elements"],
                 relationships["dominant_relationship"],
                 seasonal["is_seasonally_favorable"]
@@ -957,7 +1107,7 @@ class HexagramAnalyzer:
         else:
             return "不利"
 
-    def _get_recommendations(self, weak_elements: List[str], dominant_relation: str, seasonal_favorable: bool) -> List[str]:
+    def _get_element_recommendations(self, weak_elements: List[str], dominant_relation: str, seasonal_favorable: bool) -> List[str]:
         """生成五行调节建议"""
         recommendations = []
         
@@ -989,23 +1139,18 @@ class HexagramAnalyzer:
         ]
         return significances[position]
 
-    def _get_line_element(self, position: int) -> str:
-        """获取爻位的五行属性"""
-        trigram = self.TRIGRAMS[tuple(self.hexagram.lines[position:position+3])]
-        return self.five_elements.get_trigram_element(trigram)
-
     def _determine_ten_god(self, day_master: str, line_element: str, is_yang: bool) -> str:
         """确定十神关系"""
-        relation = self.five_elements.get_relation(day_master, line_element)
+        relation_type = self.five_elements.relation_type(day_master, line_element)
         
         # 根据五行关系和阴阳确定十神
-        if relation["type"] == "生":
+        if relation_type == "生":
             return "正印" if is_yang else "偏印"
-        elif relation["type"] == "克":
+        elif relation_type == "克":
             return "正官" if is_yang else "七杀"
-        elif relation["type"] == "泄":
+        elif relation_type == "泄":
             return "正财" if is_yang else "偏财"
-        elif relation["type"] == "化":
+        elif relation_type == "化":
             return "食神" if is_yang else "伤官"
         else:  # 同类
             return "比肩" if is_yang else "劫财"
@@ -1046,14 +1191,15 @@ class HexagramAnalyzer:
             "overall_judgment": self._get_overall_judgment()
         }
 
+    @analysis_node("_get_changed_lines")
+    @instrumented()
+    @static_section("hexagram_changes")
     def analyze_hexagram_changes(self) -> Dict:
         """分析卦象变化的完整信息"""
         # 获取原卦和变卦信息
         original_lines = self.hexagram.lines
         changing_positions = self.hexagram.changing_lines
-        changed_lines = original_lines.copy()
-        for pos in changing_positions:
-            changed_lines[pos] = 1 if original_lines[pos] == 0 else 0
+        changed_lines = self._get_changed_lines()
 
         # 分析变化的性质
         change_nature = self._analyze_change_nature(original_lines, changed_lines, changing_positions)
@@ -1271,6 +1417,151 @@ class HexagramAnalyzer:
         
         return recommendations
 
+    def _calculate_change_intensity(self, change_count: int, positions: List[int]) -> str:
+        """计算变化强度（五爻发动加重一级）"""
+        score = change_count + (1 if 4 in positions else 0)
+        if score >= 4:
+            return "强"
+        elif score >= 2:
+            return "中"
+        return "弱"
+
+    def _get_position_significance(self, position: int) -> float:
+        """获取爻位（0-5）的重要程度"""
+        return self.POSITION_SIGNIFICANCE[position]
+
+    def _calculate_impact_scope(self, positions: List[int]) -> str:
+        """计算影响范围"""
+        if not positions:
+            return "无"
+        inner = any(pos < 3 for pos in positions)
+        outer = any(pos >= 3 for pos in positions)
+        if inner and outer:
+            return "内外"
+        return "内卦" if inner else "外卦"
+
+    def _calculate_impact_intensity(self, positions: List[int]) -> str:
+        """计算影响强度"""
+        total = sum(self._get_position_significance(pos) for pos in positions)
+        if total >= 2:
+            return "强"
+        elif total >= 1:
+            return "中"
+        return "弱"
+
+    def _calculate_impact_duration(self, positions: List[int]) -> str:
+        """计算影响持续时间（取最高的动爻）"""
+        if not positions:
+            return "无"
+        highest = max(positions)
+        if highest < 2:
+            return "短期"
+        elif highest < 4:
+            return "中期"
+        return "长期"
+
+    def _calculate_temporal_span(self, positions: List[int]) -> str:
+        """计算变化的时间跨度"""
+        if not positions:
+            return "无"
+        span = max(positions) - min(positions)
+        if span <= 1:
+            return "短期"
+        elif span <= 3:
+            return "中期"
+        return "长期"
+
+    def _analyze_development_pattern(self, positions: List[int]) -> str:
+        """分析发展模式"""
+        if not positions:
+            return "稳定"
+        if len(positions) == 1:
+            return "突变"
+        ordered = sorted(positions)
+        if all(b - a == 1 for a, b in zip(ordered, ordered[1:])):
+            return "连续发展"
+        return "跳跃发展"
+
+    def _generate_timing_suggestions(self, positions: List[int]) -> List[str]:
+        """生成时机建议"""
+        if not positions:
+            return ["时机未到，静待其变"]
+        suggestions = []
+        if min(positions) < 3:
+            suggestions.append("变化始于内部，宜及早准备")
+        else:
+            suggestions.append("变化来自外部，宜顺势而为")
+        if 4 in positions:
+            suggestions.append("五爻发动，关键时机已至")
+        return suggestions
+
+    def _get_hexagram_attributes(self, lines: List[int]) -> Dict:
+        """获取卦的基本属性"""
+        code = encode_lines(lines)
+        info = HEXAGRAM_TABLE[code]
+        element_table = self.five_elements.TRIGRAM_ELEMENT_TABLE
+        return {
+            "code": code,
+            "name": info.get("name", ""),
+            "nature": info.get("nature", ""),
+            "upper_trigram": TRIGRAM_NAMES[code >> 3],
+            "lower_trigram": TRIGRAM_NAMES[code & 7],
+            "upper_element": element_table[code >> 3],
+            "lower_element": element_table[code & 7],
+            "yang_count": sum(lines)
+        }
+
+    def _analyze_core_transformation(self, original: Dict, changed: Dict) -> Dict:
+        """分析卦象转化的核心"""
+        if original["code"] == changed["code"]:
+            description = f"{original['name']}卦不变，{original['nature']}"
+        else:
+            description = f"由{original['name']}之{original['nature']}，转为{changed['name']}之{changed['nature']}"
+        return {
+            "from": original["name"],
+            "to": changed["name"],
+            "description": description
+        }
+
+    def _analyze_domain_changes(self, original: Dict, changed: Dict, positions: List[int]) -> Dict:
+        """分析内外卦的变化"""
+        return {
+            "内卦": {
+                "from": original["lower_trigram"],
+                "to": changed["lower_trigram"],
+                "changed": any(pos < 3 for pos in positions),
+                "element_change": (original["lower_element"], changed["lower_element"])
+            },
+            "外卦": {
+                "from": original["upper_trigram"],
+                "to": changed["upper_trigram"],
+                "changed": any(pos >= 3 for pos in positions),
+                "element_change": (original["upper_element"], changed["upper_element"])
+            }
+        }
+
+    def _get_transformation_nature(self, original: Dict, changed: Dict) -> str:
+        """判断转化性质（阳爻增减）"""
+        if original["code"] == changed["code"]:
+            return "不变"
+        if changed["yang_count"] > original["yang_count"]:
+            return "趋于刚健"
+        if changed["yang_count"] < original["yang_count"]:
+            return "趋于柔顺"
+        return "刚柔相易"
+
+    def _get_key_implications(self, core: Dict, domain: Dict) -> List[str]:
+        """归纳转化的要点"""
+        implications = [core["description"]]
+        if domain["内卦"]["changed"]:
+            implications.append(f"内卦{domain['内卦']['from']}变{domain['内卦']['to']}，自身状况转变")
+        if domain["外卦"]["changed"]:
+            implications.append(f"外卦{domain['外卦']['from']}变{domain['外卦']['to']}，外部环境转变")
+        return implications
+
+    @analysis_node()
+    @instrumented()
+    @static_section("directions")
     def analyze_directions(self) -> Dict:
         """分析卦象的方位特征"""
         # 基本方位属性
@@ -1477,6 +1768,9 @@ class HexagramAnalyzer:
             
         return recommendations
 
+    @analysis_node("analyze_directions", "analyze_hexagram_changes")
+    @instrumented()
+    @static_section("trends")
     def predict_trends(self) -> Dict:
         """预测发展趋势"""
         # 获取基础分析数据
@@ -1651,20 +1945,25 @@ class HexagramAnalyzer:
             "description": description
         }
 
+    @analysis_node()
+    @static_section("wu_xing")
     def _analyze_wu_xing(self) -> Dict:
         """分析五行关系"""
         try:
             # 获取本卦上下卦的五行属性
-            upper_element = self.five_elements.get_trigram_element(self.hexagram.original_trigrams[1])
-            lower_element = self.five_elements.get_trigram_element(self.hexagram.original_trigrams[0])
+            code = self.hexagram.code
+            changed_code = self.hexagram.changed_code
+            element_table = self.five_elements.TRIGRAM_ELEMENT_TABLE
+            upper_element = element_table[code >> 3]
+            lower_element = element_table[code & 7]
             
             # 分析本卦五行关系
             relation = self.five_elements.get_relation(upper_element, lower_element)
             recommendations = self.five_elements.get_relationship_recommendations(upper_element, lower_element)
             
             # 获取变卦五行属性和关系
-            changed_upper = self.five_elements.get_trigram_element(self.hexagram.changed_trigrams[1])
-            changed_lower = self.five_elements.get_trigram_element(self.hexagram.changed_trigrams[0])
+            changed_upper = element_table[changed_code >> 3]
+            changed_lower = element_table[changed_code & 7]
             changed_relation = self.five_elements.get_relation(changed_upper, changed_lower)
             changed_recommendations = self.five_elements.get_relationship_recommendations(changed_upper, changed_lower)
             
@@ -1751,57 +2050,38 @@ class HexagramAnalyzer:
         Returns:
             str: 五行属性
         """
-        # 根据卦的五行属性和爻位确定五行
-        if position > 3:  # 上卦
-            return self.five_elements.get_trigram_element(self.hexagram.original_trigrams[1])
-        return self.five_elements.get_trigram_element(self.hexagram.original_trigrams[0])  # 下卦
+        # 爻的五行取纳甲地支的五行
+        return self.najia.elements[position - 1]
 
+    @analysis_node()
     def _get_shi_ying(self) -> Dict:
         """获取世应爻位置
         Returns:
             Dict: 包含世爻和应爻位置的字典
         """
-        # 世应规则：
-        # 乾宫：世五应二
-        # 兑宫：世四应一
-        # 离宫：世三应六
-        # 震宫：世二应五
-        # 巽宫：世一应四
-        # 坎宫：世六应三
-        # 艮宫：世五应二
-        # 坤宫：世四应一
-        shi_ying_map = {
-            "乾": (5, 2),
-            "兑": (4, 1),
-            "离": (3, 6),
-            "震": (2, 5),
-            "巽": (1, 4),
-            "坎": (6, 3),
-            "艮": (5, 2),
-            "坤": (4, 1)
-        }
-        
-        shi, ying = shi_ying_map.get(self.hexagram.gong, (0, 0))
+        # 世应按八宫世代查纳甲表：本宫世六，一至五世依次世一至世五，游魂世四，归魂世三，应与世相隔两爻
+        najia = self.najia
+        shi, ying = najia.shi, najia.ying
+        shi_state = "动" if self._is_changing(shi) else "静"
+        ying_state = "动" if self._is_changing(ying) else "静"
         
         return {
             "shi": shi,
             "ying": ying,
-            "shi_state": "动" if shi in self.hexagram.changing_lines else "静",
-            "ying_state": "动" if ying in self.hexagram.changing_lines else "静",
-            "description": self._get_shi_ying_description(shi, ying)
+            "generation": najia.generation,
+            "shi_state": shi_state,
+            "ying_state": ying_state,
+            "description": self._get_shi_ying_description(shi_state, ying_state)
         }
         
-    def _get_shi_ying_description(self, shi: int, ying: int) -> str:
+    def _get_shi_ying_description(self, shi_state: str, ying_state: str) -> str:
         """获取世应关系描述
         Args:
-            shi: 世爻位置
-            ying: 应爻位置
+            shi_state: 世爻动静
+            ying_state: 应爻动静
         Returns:
             str: 世应关系描述
         """
-        shi_state = "动" if shi in self.hexagram.changing_lines else "静"
-        ying_state = "动" if ying in self.hexagram.changing_lines else "静"
-        
         if shi_state == "动" and ying_state == "动":
             return "世应俱动，变化显著"
         elif shi_state == "静" and ying_state == "静":
@@ -1811,6 +2091,7 @@ class HexagramAnalyzer:
         else:  # shi_state == "静" and ying_state == "动"
             return "世静应动，被动变化"
             
+    @analysis_node("_get_shi_ying")
     def _analyze_shi_yao(self) -> Dict:
         """分析世爻特征
         Returns:
@@ -1821,7 +2102,7 @@ class HexagramAnalyzer:
         
         # 获取世爻的基本特征
         line_value = self.hexagram.lines[shi_position - 1]  # 世爻的阴阳值
-        is_changing = shi_position in self.hexagram.changing_lines
+        is_changing = self._is_changing(shi_position)
         position_nature = self._get_position_nature(shi_position)
         line_nature = "阳" if line_value == 1 else "阴"
         
@@ -1903,4 +2184,7 @@ class HexagramAnalyzer:
         else:
             advice.append("条件不足，建议先行积累")
             
-        return advice
\ No newline at end of file
+        return advice
+
+# 导入时检查依赖图的完整性
+check_graph(HexagramAnalyzer)
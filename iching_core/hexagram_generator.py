@@ -1,11 +1,35 @@
 from datetime import datetime
-import random
-from typing import List, Dict, Tuple
+import threading
+from typing import List, Dict, Tuple, Optional, NamedTuple, Sequence, Union
 import sys
 import os
 
+import numpy as np
+
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from models.hexagram import Hexagram, HEXAGRAM_DATA
+from models.hexagram import (
+    Hexagram, FrozenHexagram, HEXAGRAM_TABLE, HEXAGRAM_KEYS, LINES_TABLE, MASK_POSITIONS, TRIGRAM_NAMES, TRIGRAM_LINES,
+    TRIGRAM_PAIRS, PALACE_TABLE, TRANSFORM_TABLE
+)
+from iching_core.casting import CastRNG, CastingEngine, get_engine
+from iching_core.relationship_analyzer import NAJIA_TABLE, SIX_SPIRIT_NAMES
+from iching_core.time_calculator import day_cycle_index
+
+# 六爻位权（初爻为最低位）
+LINE_WEIGHTS = 1 << np.arange(6, dtype=np.uint8)
+
+# 变卦转换表与宫位表的数组形式，供批量起卦直接索引
+CHANGED_CODE_ARRAY = np.array([t.changed_code for t in TRANSFORM_TABLE], dtype=np.uint8)
+PALACE_ARRAY = np.array(PALACE_TABLE, dtype=np.uint8)
+
+class HexagramBatch(NamedTuple):
+    """批量起卦结果（按列存储的紧凑数组）"""
+    lines: np.ndarray  # (n, 6) 爻值 6/7/8/9
+    masks: np.ndarray  # (n,) 动爻掩码
+    codes: np.ndarray  # (n,) 本卦编码
+    changed_codes: np.ndarray  # (n,) 变卦编码
+    gong: np.ndarray  # (n,) 宫位（八卦三位编码）
+    hexagrams: Optional[List[Union[Hexagram, FrozenHexagram]]] = None  # 按需构建的卦象对象
 
 class HexagramGenerator:
     # 八宫
@@ -29,123 +53,168 @@ class HexagramGenerator:
         "土": ["丑", "辰", "未", "戌"]
     }
     
-    # 八卦对应数字
-    TRIGRAMS = {
-        (1, 1, 1): "乾",
-        (0, 0, 0): "坤",
-        (0, 1, 0): "坎",
-        (1, 0, 1): "离",
-        (1, 0, 0): "震",
-        (0, 0, 1): "艮",
-        (1, 1, 0): "兑",
-        (0, 1, 1): "巽"
-    }
+    # 三爻（自下而上）-> 八卦名，取自共用的三位卦码表
+    TRIGRAMS = {lines: TRIGRAM_NAMES[code] for code, lines in enumerate(TRIGRAM_LINES)}
 
-    def __init__(self):
-        self.current_time = datetime.now()
+    def __init__(self, seed: Optional[int] = None, stream: int = 0,
+                 method: Union[str, CastingEngine] = "coin"):
+        """
+        Args:
+            seed: 随机种子，缺省时随机选取（仍记录在卦象上以便重放）
+            stream: 随机流编号，并行任务各用一个编号即可互不相关
+            method: 起卦法，coin（三钱法）、yarrow（大衍筮法）、plum_blossom（梅花易数）或自定义引擎
+        """
+        self.rng = CastRNG(seed, stream)
+        self.engine = get_engine(method)
+        self._next_index = 0
+        self._index_lock = threading.Lock()
 
-    def generate_hexagram(self, topic: str = "") -> Hexagram:
-        """生成卦象"""
-        lines = []
-        changing_lines = []
+    @classmethod
+    def replay(cls, seed: int, stream: int, cast_index: int, topic: str = "",
+               method: str = "coin", time: Optional[datetime] = None) -> Hexagram:
+        """按记录的 (seed, stream, cast_index) 重放一卦（时间起卦法须传入原起卦时间）"""
+        return cls(seed, stream, method).cast(cast_index, topic, time)
+
+    def generate_hexagram(self, topic: str = "", time: Optional[datetime] = None) -> Hexagram:
+        """生成卦象
         
-        # 生成六爻
-        for i in range(6):
-            line, is_changing = self._generate_line()
-            lines.append(line)
-            if is_changing:
-                changing_lines.append(i)
+        Args:
+            topic: 预测主题
+            time: 起卦时间，缺省为调用时的当前时间
+        """
+        return self.cast(self._reserve_indices(1), topic, time)
+
+    def cast(self, index: int, topic: str = "", time: Optional[datetime] = None) -> Hexagram:
+        """生成随机流中第 index 卦，起卦时间缺省为当前时间"""
+        time = time or datetime.now()
+        word = self.rng.word(index)
+        code, mask = self._encode_line_values(self.engine.cast(word, time, topic))
+        return self._build_hexagram(code, mask, topic, index, time=time)
+
+    def generate_batch(self, n: int, seed: Optional[int] = None,
+                       build_hexagrams: bool = False,
+                       start: Optional[int] = None,
+                       times: Optional[Sequence[datetime]] = None,
+                       topic: str = "",
+                       frozen: bool = False) -> HexagramBatch:
+        """批量起卦：一次性取出 n 卦的全部随机字
         
-        # 生成本卦和变卦
-        original_trigrams = self._get_trigrams(lines)
-        original_name = self._get_hexagram_name(original_trigrams)
+        Args:
+            n: 起卦数量
+            seed: 随机种子，给定时使用该种子的同一 stream，从第0卦开始
+            build_hexagrams: 是否同时构建 Hexagram 对象
+            start: 起始卦序号，缺省时接续本生成器已用的序号
+            times: 每卦的起卦时间，缺省各卦均为调用时的当前时间
+            topic: 预测主题
+            frozen: 构建 Hexagram 对象时改为构建不可变的紧凑 FrozenHexagram
+        """
+        rng = self.rng if seed is None else CastRNG(seed, self.rng.stream)
+        if start is None:
+            start = self._reserve_indices(n) if seed is None else 0
+        words = rng.words(start, n)
+        if times is None:
+            now = datetime.now()
+            times = np.full(n, np.datetime64(now, "m"))
+            cast_times = [now] * n
+        else:
+            cast_times = np.broadcast_to(np.asarray(times, dtype="datetime64[us]"), (n,)).tolist()
+        lines = self.engine.cast_batch(words, times, topic)
         
-        changed_lines = lines.copy()
-        for pos in changing_lines:
-            changed_lines[pos] = 1 if lines[pos] == 0 else 0
+        # 爻值 6/7/8/9：奇数为阳，6、9 为动爻
+        yang = lines & 1
+        changing = (lines == 6) | (lines == 9)
         
-        changed_trigrams = self._get_trigrams(changed_lines)
-        changed_name = self._get_hexagram_name(changed_trigrams)
+        codes = yang @ LINE_WEIGHTS
+        masks = changing.astype(np.uint8) @ LINE_WEIGHTS
+        changed_codes = CHANGED_CODE_ARRAY[codes.astype(np.intp) << 6 | masks]
+        gong = PALACE_ARRAY[codes]
         
-        # 获取宫位
-        gong = self._get_gong(original_trigrams)
+        hexagrams = None
+        if build_hexagrams and frozen:
+            method = self.engine.name
+            hexagrams = [
+                FrozenHexagram(code, mask, cast_times[i], topic, (rng.seed, rng.stream, start + i, method))
+                for i, (code, mask) in enumerate(zip(codes.tolist(), masks.tolist()))
+            ]
+        elif build_hexagrams:
+            hexagrams = [
+                self._build_hexagram(code, mask, topic, start + i, rng, cast_times[i])
+                for i, (code, mask) in enumerate(zip(codes.tolist(), masks.tolist()))
+            ]
         
-        # 生成干支和五行
-        gan_zhi = self._generate_gan_zhi()
+        return HexagramBatch(lines, masks, codes, changed_codes, gong, hexagrams)
+
+    def _reserve_indices(self, n: int) -> int:
+        """占用 n 个连续卦序号，返回起始序号"""
+        with self._index_lock:
+            start = self._next_index
+            self._next_index += n
+        return start
+
+    def _encode_line_values(self, values: Sequence[int]) -> Tuple[int, int]:
+        """由六个爻值得到卦码和动爻掩码"""
+        code = 0
+        mask = 0
+        for i, value in enumerate(values):
+            # 6: 老阴 (0, True)
+            # 7: 少阳 (1, False)
+            # 8: 少阴 (0, False)
+            # 9: 老阳 (1, True)
+            if value & 1:
+                code |= 1 << i
+            if value == 6 or value == 9:
+                mask |= 1 << i
+        return code, mask
+
+    def _build_hexagram(self, code: int, mask: int, topic: str, index: int,
+                        rng: Optional[CastRNG] = None, time: Optional[datetime] = None) -> Hexagram:
+        """根据卦码和动爻掩码构建卦象，起卦时间缺省为当前时间"""
+        rng = rng or self.rng
+        time = time or datetime.now()
+        
+        # 查表得到变卦与宫位
+        transformation = TRANSFORM_TABLE[code << 6 | mask]
+        changed_code = transformation.changed_code
         
         hexagram = Hexagram()
-        hexagram.name = original_name
-        hexagram.changed_name = changed_name
-        hexagram.lines = lines
-        hexagram.changing_lines = changing_lines
-        hexagram.time = self.current_time
+        hexagram.name = self._get_hexagram_name(code)
+        hexagram.changed_name = self._get_hexagram_name(changed_code)
+        hexagram.code = code
+        hexagram.changed_code = changed_code
+        hexagram.mask = mask
+        hexagram.lines = list(LINES_TABLE[code])
+        hexagram.changing_lines = list(MASK_POSITIONS[mask])
+        hexagram.time = time
         hexagram.topic = topic
-        hexagram.gong = gong
-        hexagram.original_trigrams = original_trigrams
-        hexagram.changed_trigrams = changed_trigrams
-        hexagram.gan_zhi = gan_zhi
+        hexagram.gong = transformation.palace
+        hexagram.original_trigrams = TRIGRAM_PAIRS[code]
+        hexagram.changed_trigrams = transformation.changed_trigrams
+        
+        # 纳甲与六亲按卦码查表，日干支与六神按起卦日查表
+        day_index = day_cycle_index(time)
+        najia = NAJIA_TABLE[code]
+        hexagram.gan_zhi = list(najia.gan_zhi)
+        hexagram.celestial_stem = self.HEAVENLY_STEMS[day_index % 10]
+        hexagram.terrestrial_branch = self.EARTHLY_BRANCHES[day_index % 12]
+        hexagram.six_relatives = list(najia.relatives)
+        hexagram.six_spirits = list(SIX_SPIRIT_NAMES[day_index % 10])
+        hexagram.seed = rng.seed
+        hexagram.stream = rng.stream
+        hexagram.cast_index = index
+        hexagram.method = self.engine.name
         
         return hexagram
 
-    def _generate_line(self) -> Tuple[int, bool]:
-        """生成单爻"""
-        coins = [random.randint(0, 1) for _ in range(3)]
-        total = sum(coins)
-        
-        # 6: 老阴 (0, True)
-        # 7: 少阳 (1, False)
-        # 8: 少阴 (0, False)
-        # 9: 老阳 (1, True)
-        if total == 0:  # 老阴
-            return 0, True
-        elif total == 1:  # 少阳
-            return 1, False
-        elif total == 2:  # 少阴
-            return 0, False
-        else:  # 老阳
-            return 1, True
-
-    def _get_trigrams(self, lines: List[int]) -> Tuple[str, str]:
-        """获取上下卦名"""
-        upper = tuple(lines[3:])
-        lower = tuple(lines[:3])
-        return self.TRIGRAMS[lower], self.TRIGRAMS[upper]
-
-    def _get_hexagram_name(self, trigrams: Tuple[str, str]) -> str:
+    def _get_hexagram_name(self, code: int) -> str:
         """获取卦名"""
-        lower, upper = trigrams
-        return f"{lower}_{upper}"
-
-    def _get_gong(self, trigrams: Tuple[str, str]) -> str:
-        """获取宫位"""
-        lower, _ = trigrams
-        return lower
-
-    def _generate_gan_zhi(self) -> List[str]:
-        """生成干支"""
-        gan_zhi = []
-        start_gan = random.randint(0, 9)
-        start_zhi = random.randint(0, 11)
-        
-        for i in range(6):
-            gan = self.HEAVENLY_STEMS[(start_gan + i) % 10]
-            zhi = self.EARTHLY_BRANCHES[(start_zhi + i) % 12]
-            element = self._get_element_from_zhi(zhi)
-            gan_zhi.append(f"{gan}{zhi}{element}")
-        
-        return gan_zhi
-
-    def _get_element_from_zhi(self, zhi: str) -> str:
-        """根据地支获取五行"""
-        for element, zhis in self.FIVE_ELEMENTS.items():
-            if zhi in zhis:
-                return element
-        return "土"  # 默认返回土
+        return HEXAGRAM_KEYS[code]
 
     def get_hexagram_info(self, hexagram: Hexagram) -> Dict:
         """获取卦象的完整信息"""
-        info = HEXAGRAM_DATA.get(hexagram.name, {})
+        info = dict(HEXAGRAM_TABLE[hexagram.code])
         info.update({
+            "code": hexagram.code,
+            "mask": hexagram.mask,
             "lines": hexagram.lines,
             "changing_lines": hexagram.changing_lines,
             "time": hexagram.time.isoformat(),
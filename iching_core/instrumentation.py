@@ -0,0 +1,152 @@
+import bisect
+import functools
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+# 耗时直方图的桶上界（毫秒），最后一个桶收集超出上界的调用
+HISTOGRAM_BUCKETS_MS = (0.1, 0.5, 1.0, 5.0, 10.0, 50.0, 100.0, 500.0, 1000.0)
+
+class SectionStats:
+    """单个分析段的累计统计"""
+
+    __slots__ = ("calls", "errors", "wall_total", "wall_max", "cpu_total", "net_bytes", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.wall_total = 0.0
+        self.wall_max = 0.0
+        self.cpu_total = 0.0
+        self.net_bytes = 0  # tracemalloc 记录的净分配字节数（开启内存跟踪时）
+        self.histogram = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "wall_total": self.wall_total,
+            "wall_mean": self.wall_total / self.calls if self.calls else 0.0,
+            "wall_max": self.wall_max,
+            "cpu_total": self.cpu_total,
+            "net_bytes": self.net_bytes,
+            "histogram": {
+                "buckets_ms": list(HISTOGRAM_BUCKETS_MS),
+                "counts": list(self.histogram)
+            }
+        }
+
+class InstrumentationRegistry:
+    """进程内的分析耗时登记表
+
+    默认关闭，关闭时被测方法只多一次属性判断。开启后按段记录
+    调用次数、墙钟时间、CPU 时间与耗时直方图；开启内存跟踪时
+    另用 tracemalloc 记录净分配字节数（开销较大，仅用于排查）。
+    耗时包含嵌套调用的子段。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_allocations = False
+        self._started_tracemalloc = False
+        self._stats: Dict[str, SectionStats] = {}
+        self._lock = threading.Lock()
+
+    def enable(self, trace_allocations: bool = False) -> None:
+        """开启记录
+
+        Args:
+            trace_allocations: 是否同时用 tracemalloc 记录内存分配
+        """
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.trace_allocations = trace_allocations
+        self.enabled = True
+
+    def disable(self) -> None:
+        """关闭记录（已有统计保留）"""
+        self.enabled = False
+        self.trace_allocations = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def reset(self) -> None:
+        """清空统计"""
+        with self._lock:
+            self._stats.clear()
+
+    def call(self, name: str, func: Callable, *args, **kwargs) -> Any:
+        """调用 func 并记入名为 name 的段"""
+        if not self.enabled:
+            return func(*args, **kwargs)
+        trace = self.trace_allocations and tracemalloc.is_tracing()
+        start_bytes = tracemalloc.get_traced_memory()[0] if trace else 0
+        start_cpu = time.process_time()
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - start_cpu
+            net_bytes = tracemalloc.get_traced_memory()[0] - start_bytes if trace else 0
+            self._record(name, wall, cpu, net_bytes, failed)
+
+    def _record(self, name: str, wall: float, cpu: float, net_bytes: int, failed: bool) -> None:
+        bucket = bisect.bisect_left(HISTOGRAM_BUCKETS_MS, wall * 1000)
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = SectionStats()
+            stats.calls += 1
+            stats.errors += failed
+            stats.wall_total += wall
+            stats.wall_max = max(stats.wall_max, wall)
+            stats.cpu_total += cpu
+            stats.net_bytes += net_bytes
+            stats.histogram[bucket] += 1
+
+    def sections(self) -> List[str]:
+        """已记录的段名"""
+        with self._lock:
+            return sorted(self._stats)
+
+    def snapshot(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """读取统计：缺省为全部段，按总耗时降序"""
+        with self._lock:
+            if name is not None:
+                stats = self._stats.get(name)
+                return stats.to_dict() if stats else {}
+            ordered = sorted(self._stats.items(), key=lambda item: item[1].wall_total, reverse=True)
+            return {
+                "enabled": self.enabled,
+                "trace_allocations": self.trace_allocations,
+                "sections": {section: stats.to_dict() for section, stats in ordered}
+            }
+
+# 进程内共享的登记表
+REGISTRY = InstrumentationRegistry()
+
+def instrumented(name: Optional[str] = None,
+                 registry: InstrumentationRegistry = REGISTRY) -> Callable[[Callable], Callable]:
+    """将方法的调用记入登记表
+
+    Args:
+        name: 段名，缺省为方法的限定名（如 HexagramAnalyzer.predict_trends）
+        registry: 登记表
+    """
+    def decorator(func: Callable) -> Callable:
+        section = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            return registry.call(section, func, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,208 @@
+"""纳甲装卦
+
+按京房八宫与纳甲法为 64 卦预先排好宫位、世代、世应、各爻干支、六亲与伏神，
+以紧凑数组（供批量索引）和每卦一条的 NajiaInfo 记录（供单卦查询）两种形式保存，
+导入时构建一次，此后装卦只是查表。六神只由日干决定，另存为 10×6 表。
+"""
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.hexagram import TRIGRAM_NAMES, PALACE_TABLE, GENERATION_TABLE, GENERATION_NAMES
+from iching_core.five_elements import FiveElements
+from iching_core.time_calculator import HEAVENLY_STEMS, EARTHLY_BRANCHES, BRANCH_ELEMENTS, day_cycle_index
+
+# 八卦纳干：(内卦天干, 外卦天干)
+TRIGRAM_STEMS: Dict[str, Tuple[str, str]] = {
+    "乾": ("甲", "壬"),
+    "坤": ("乙", "癸"),
+    "震": ("庚", "庚"),
+    "巽": ("辛", "辛"),
+    "坎": ("戊", "戊"),
+    "离": ("己", "己"),
+    "艮": ("丙", "丙"),
+    "兑": ("丁", "丁")
+}
+
+# 八卦纳支：(内卦初、二、三爻, 外卦四、五、上爻)
+TRIGRAM_BRANCHES: Dict[str, Tuple[str, str]] = {
+    "乾": ("子寅辰", "午申戌"),
+    "坤": ("未巳卯", "丑亥酉"),
+    "震": ("子寅辰", "午申戌"),
+    "巽": ("丑亥酉", "未巳卯"),
+    "坎": ("寅辰午", "申戌子"),
+    "离": ("卯丑亥", "酉未巳"),
+    "艮": ("辰午申", "戌子寅"),
+    "兑": ("巳卯丑", "亥酉未")
+}
+
+# 六亲
+SIX_RELATIVES: Tuple[str, ...] = ("兄弟", "子孙", "妻财", "官鬼", "父母")
+
+# 六神
+SIX_SPIRITS: Tuple[str, ...] = ("青龙", "朱雀", "勾陈", "螣蛇", "白虎", "玄武")
+
+# 日干 -> 初爻所起六神：甲乙起青龙，丙丁起朱雀，戊起勾陈，己起螣蛇，庚辛起白虎，壬癸起玄武
+SPIRIT_STARTS: Tuple[int, ...] = (0, 0, 1, 1, 2, 3, 4, 4, 5, 5)
+
+# 六神表：[日干序号][爻位 0-5] -> 六神序号，自初爻依次而上
+SIX_SPIRIT_TABLE = np.array([[(start + i) % 6 for i in range(6)] for start in SPIRIT_STARTS], dtype=np.uint8)
+SIX_SPIRIT_TABLE.flags.writeable = False
+
+# 日干序号 -> 六爻六神名
+SIX_SPIRIT_NAMES: Tuple[Tuple[str, ...], ...] = tuple(
+    tuple(SIX_SPIRITS[spirit] for spirit in row) for row in SIX_SPIRIT_TABLE.tolist()
+)
+
+# 世代 -> 世爻位置（1-6）
+GENERATION_SHI: Tuple[int, ...] = (6, 1, 2, 3, 4, 5, 4, 3)
+
+# 以宫五行为我，按关系类型（RELATION_TYPES 顺序：生克泄化同类）定六亲：
+# 我生子孙、我克妻财、生我父母、克我官鬼、同我兄弟
+RELATION_RELATIVES: Tuple[str, ...] = ("子孙", "妻财", "父母", "官鬼", "兄弟")
+
+def _relative_table() -> np.ndarray:
+    """5×5 六亲表：[宫五行序号][爻五行序号] -> 六亲序号"""
+    relatives = np.array([SIX_RELATIVES.index(relative) for relative in RELATION_RELATIVES], dtype=np.uint8)
+    return relatives[FiveElements.RELATION_MATRIX.type_id]
+
+RELATIVE_TABLE = _relative_table()
+
+def _line_stems_branches(code: int) -> Tuple[List[int], List[int]]:
+    """按纳甲法排出一卦六爻的天干、地支序号"""
+    stems = []
+    branches = []
+    for half, trigram in enumerate((code & 7, code >> 3)):
+        name = TRIGRAM_NAMES[trigram]
+        stem = HEAVENLY_STEMS.index(TRIGRAM_STEMS[name][half])
+        for branch in TRIGRAM_BRANCHES[name][half]:
+            stems.append(stem)
+            branches.append(EARTHLY_BRANCHES.index(branch))
+    return stems, branches
+
+def _build_arrays() -> Dict[str, np.ndarray]:
+    """构建按卦码索引的纳甲数组"""
+    element_index = {element: i for i, element in enumerate(FiveElements.ELEMENTS)}
+    branch_element = np.array([element_index[e] for e in BRANCH_ELEMENTS], dtype=np.uint8)
+
+    palace = np.array(PALACE_TABLE, dtype=np.uint8)
+    generation = np.array(GENERATION_TABLE, dtype=np.uint8)
+    shi = np.array(GENERATION_SHI, dtype=np.uint8)[generation]
+    ying = np.where(shi > 3, shi - 3, shi + 3).astype(np.uint8)
+
+    stems = np.zeros((64, 6), dtype=np.uint8)
+    branches = np.zeros((64, 6), dtype=np.uint8)
+    for code in range(64):
+        stems[code], branches[code] = _line_stems_branches(code)
+
+    palace_element = np.array(
+        [element_index[FiveElements.TRIGRAM_ELEMENT_TABLE[p]] for p in PALACE_TABLE], dtype=np.intp
+    )
+    elements = branch_element[branches]
+    relatives = RELATIVE_TABLE[palace_element[:, None], elements]
+
+    # 伏神：本卦缺少的六亲，取本宫首卦同位之爻伏于其下，值为伏神六亲序号，-1 为无
+    fu_shen = np.full((64, 6), -1, dtype=np.int8)
+    for code in range(64):
+        pure = int(palace[code]) << 3 | int(palace[code])
+        present = set(relatives[code].tolist())
+        for position, relative in enumerate(relatives[pure].tolist()):
+            if relative not in present:
+                fu_shen[code, position] = relative
+
+    arrays = {
+        "palace": palace,
+        "generation": generation,
+        "shi": shi,
+        "ying": ying,
+        "stems": stems,
+        "branches": branches,
+        "elements": elements,
+        "relatives": relatives,
+        "fu_shen": fu_shen
+    }
+    for array in arrays.values():
+        array.flags.writeable = False
+    return arrays
+
+# 纳甲数组（按卦码索引，爻按初爻在前）：
+# palace 宫位三位卦码、generation 世代序号、shi/ying 世应爻位（1-6）、
+# stems/branches 天干地支序号、elements 五行序号、relatives 六亲序号、fu_shen 伏神六亲序号（-1 为无）
+NAJIA_ARRAYS: Dict[str, np.ndarray] = _build_arrays()
+
+class FuShen(NamedTuple):
+    """伏神：本卦所缺六亲，伏于某爻之下"""
+    position: int  # 所伏爻位（1-6）
+    relative: str  # 六亲
+    gan_zhi: str  # 干支五行，如 "甲寅木"
+
+class NajiaInfo(NamedTuple):
+    """一卦的纳甲装卦结果"""
+    palace: str  # 所属宫
+    palace_element: str  # 宫五行
+    generation: str  # 世代
+    shi: int  # 世爻位置（1-6）
+    ying: int  # 应爻位置（1-6）
+    gan_zhi: Tuple[str, ...]  # 各爻干支五行，如 "甲子水"
+    elements: Tuple[str, ...]  # 各爻五行
+    relatives: Tuple[str, ...]  # 各爻六亲
+    fu_shen: Tuple[FuShen, ...]  # 伏神
+
+def _line_gan_zhi(stem: int, branch: int) -> str:
+    return f"{HEAVENLY_STEMS[stem]}{EARTHLY_BRANCHES[branch]}{BRANCH_ELEMENTS[branch]}"
+
+def _najia_info(code: int) -> NajiaInfo:
+    arrays = NAJIA_ARRAYS
+    palace = int(arrays["palace"][code])
+    pure = palace << 3 | palace
+    stems = arrays["stems"][code].tolist()
+    branches = arrays["branches"][code].tolist()
+    fu_shen = tuple(
+        FuShen(
+            position + 1,
+            SIX_RELATIVES[relative],
+            _line_gan_zhi(int(arrays["stems"][pure, position]), int(arrays["branches"][pure, position]))
+        )
+        for position, relative in enumerate(arrays["fu_shen"][code].tolist())
+        if relative >= 0
+    )
+    return NajiaInfo(
+        TRIGRAM_NAMES[palace],
+        FiveElements.TRIGRAM_ELEMENT_TABLE[palace],
+        GENERATION_NAMES[int(arrays["generation"][code])],
+        int(arrays["shi"][code]),
+        int(arrays["ying"][code]),
+        tuple(_line_gan_zhi(stem, branch) for stem, branch in zip(stems, branches)),
+        tuple(BRANCH_ELEMENTS[branch] for branch in branches),
+        tuple(SIX_RELATIVES[relative] for relative in arrays["relatives"][code].tolist()),
+        fu_shen
+    )
+
+# 卦码 -> 纳甲装卦结果
+NAJIA_TABLE: Tuple[NajiaInfo, ...] = tuple(_najia_info(code) for code in range(64))
+
+def najia(code: int) -> NajiaInfo:
+    """查询卦码的纳甲装卦结果"""
+    return NAJIA_TABLE[code]
+
+def find_fu_shen(code: int, relative: str) -> Optional[FuShen]:
+    """查询本卦所缺某六亲的伏神，不缺时返回 None"""
+    for fu_shen in NAJIA_TABLE[code].fu_shen:
+        if fu_shen.relative == relative:
+            return fu_shen
+    return None
+
+def six_relatives(code: int) -> Tuple[str, ...]:
+    """卦码对应的六爻六亲"""
+    return NAJIA_TABLE[code].relatives
+
+def six_spirits(stem: str) -> Tuple[str, ...]:
+    """日干对应的六爻六神"""
+    return SIX_SPIRIT_NAMES[HEAVENLY_STEMS.index(stem)]
+
+def day_six_spirits(day) -> Tuple[str, ...]:
+    """起卦日的六爻六神"""
+    return SIX_SPIRIT_NAMES[day_cycle_index(day) % 10]
@@ -0,0 +1,63 @@
+import threading
+from typing import Dict
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.corpus import CORPORA, prewarm as prewarm_corpora
+from iching_core.five_elements import FiveElements
+from iching_core.trigrams import Trigrams
+from iching_core.hexagram_generator import HexagramGenerator
+from iching_core.static_analysis import get_static_analysis, static_analysis_state
+
+# 无状态的查表服务：进程内共用一个实例，导入时创建（由导入锁保证只创建一次）
+FIVE_ELEMENTS = FiveElements()
+TRIGRAMS = Trigrams()
+
+_generator = None
+_generator_lock = threading.Lock()
+_initialized = False
+_init_lock = threading.Lock()
+
+def get_five_elements() -> FiveElements:
+    """进程内共享的五行服务"""
+    return FIVE_ELEMENTS
+
+def get_trigrams() -> Trigrams:
+    """进程内共享的八卦服务"""
+    return TRIGRAMS
+
+def get_generator() -> HexagramGenerator:
+    """进程内共享的起卦器（随机种子，线程安全，起卦时间逐次传入）"""
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                _generator = HexagramGenerator()
+    return _generator
+
+def initialize(prewarm: bool = True) -> Dict[str, object]:
+    """服务启动时调用：创建共享实例并预热各查表数据，重复调用无副作用
+
+    Args:
+        prewarm: 是否预先解码全部卦辞分片并加载静态分析数据包
+    """
+    global _initialized
+    with _init_lock:
+        if not _initialized:
+            get_generator()
+            if prewarm:
+                prewarm_corpora()
+                get_static_analysis()
+            _initialized = True
+    return status()
+
+def status() -> Dict[str, object]:
+    """各共享服务的状态，供监控使用"""
+    return {
+        "initialized": _initialized,
+        "generator": _generator is not None,
+        "corpora": {name: corpus.stats() for name, corpus in CORPORA.items()},
+        # 只读取已加载的状态，查询状态本身不应触发数据包加载
+        "static_analysis": static_analysis_state()
+    }
@@ -0,0 +1,211 @@
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Union
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.hexagram import PALACE_TABLE
+from iching_core.casting import ENGINES, CastingEngine
+from iching_core.distribution import CHANGING_COUNTS, outcome_distribution
+from iching_core.hexagram_generator import HexagramBatch, HexagramGenerator
+
+class SimulationStats:
+    """起卦模拟的在线统计
+
+    只保存 64×64 的 (本卦, 动爻掩码) 计数，内存与模拟次数无关；
+    其余直方图均由该计数表求和得到，分块、分进程的结果可直接相加合并。
+    """
+
+    def __init__(self, joint: Optional[np.ndarray] = None):
+        self.joint = np.zeros((64, 64), dtype=np.int64) if joint is None else joint
+
+    @property
+    def casts(self) -> int:
+        """累计起卦数"""
+        return int(self.joint.sum())
+
+    def update(self, batch: HexagramBatch) -> "SimulationStats":
+        """累加一批起卦结果"""
+        cells = batch.codes.astype(np.intp) << 6 | batch.masks
+        self.joint += np.bincount(cells, minlength=4096).reshape(64, 64)
+        return self
+
+    def merge(self, other: "SimulationStats") -> "SimulationStats":
+        """合并另一份统计"""
+        self.joint += other.joint
+        return self
+
+    def by_hexagram(self) -> np.ndarray:
+        """各本卦的出现次数"""
+        return self.joint.sum(axis=1)
+
+    def by_palace(self) -> np.ndarray:
+        """各宫位的出现次数"""
+        return np.bincount(PALACE_TABLE, weights=self.by_hexagram(), minlength=8).astype(np.int64)
+
+    def by_changing_count(self) -> np.ndarray:
+        """动爻数 0-6 的直方图"""
+        return np.bincount(CHANGING_COUNTS, weights=self.joint.sum(axis=0), minlength=7).astype(np.int64)
+
+    def by_changing_position(self) -> np.ndarray:
+        """各爻位为动爻的次数"""
+        by_mask = self.joint.sum(axis=0)
+        return np.array([by_mask[np.arange(64) >> i & 1 == 1].sum() for i in range(6)], dtype=np.int64)
+
+    def chi_square(self, method: Union[str, CastingEngine] = "coin") -> Dict[str, Dict]:
+        """与理论分布做卡方检验（p 值为 Wilson-Hilferty 近似）"""
+        distribution = outcome_distribution(method)
+        casts = self.casts
+        return {
+            "hexagram": _chi_square(self.by_hexagram(), distribution.by_hexagram * casts),
+            "changing_count": _chi_square(self.by_changing_count(), distribution.by_changing_count * casts),
+            "joint": _chi_square(self.joint.ravel(), distribution.joint.ravel() * casts)
+        }
+
+    def to_dict(self) -> Dict:
+        """转换为可序列化的字典"""
+        return {"joint": self.joint.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SimulationStats":
+        """从字典恢复统计"""
+        return cls(np.array(data["joint"], dtype=np.int64))
+
+def _chi_square(observed: np.ndarray, expected: np.ndarray) -> Dict:
+    """卡方统计量、自由度与近似 p 值"""
+    cells = expected > 0
+    if not cells.any() or expected.sum() == 0:
+        return {"statistic": 0.0, "dof": 0, "p_value": 1.0}
+    statistic = float((((observed[cells] - expected[cells]) ** 2) / expected[cells]).sum())
+    dof = int(cells.sum()) - 1
+    return {"statistic": statistic, "dof": dof, "p_value": _chi_square_p_value(statistic, dof)}
+
+def _chi_square_p_value(statistic: float, dof: int) -> float:
+    """卡方分布上尾概率的 Wilson-Hilferty 近似"""
+    if dof <= 0:
+        return 1.0
+    scale = 2 / (9 * dof)
+    z = ((statistic / dof) ** (1 / 3) - (1 - scale)) / math.sqrt(scale)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def _simulate_range(seed: int, stream: int, method: Union[str, CastingEngine],
+                    start: int, n_casts: int, chunk_size: int) -> SimulationStats:
+    """模拟随机流中 [start, start + n_casts) 区间的卦（供子进程调用）"""
+    generator = HexagramGenerator(seed, stream, method)
+    stats = SimulationStats()
+    end = start + n_casts
+    while start < end:
+        size = min(chunk_size, end - start)
+        stats.update(generator.generate_batch(size, start=start))
+        start += size
+    return stats
+
+class CastSimulator:
+    """流式起卦模拟器
+
+    按块批量起卦并累加在线统计，支持断点保存与恢复。
+    基于计数器随机流，第 k 卦只由 (seed, stream, k) 决定，
+    因此分块大小、进程数不影响最终结果。
+    """
+
+    def __init__(self, seed: Optional[int] = None, stream: int = 0,
+                 method: Union[str, CastingEngine] = "coin", chunk_size: int = 1_000_000):
+        self.generator = HexagramGenerator(seed, stream, method)
+        self.chunk_size = chunk_size
+        self.stats = SimulationStats()
+        self.next_index = 0
+
+    @property
+    def seed(self) -> int:
+        return self.generator.rng.seed
+
+    @property
+    def stream(self) -> int:
+        return self.generator.rng.stream
+
+    @property
+    def method(self) -> str:
+        return self.generator.engine.name
+
+    def _checkpoint_method(self) -> str:
+        """断点中记录的起卦法名称，恢复时按名称重新取得起卦法，因此只支持已注册的起卦法"""
+        if ENGINES.get(self.method) is not self.generator.engine:
+            raise ValueError(f"Casting engine must be registered to be checkpointed: {self.method or '<unnamed>'}")
+        return self.method
+
+    def run(self, n_casts: int, checkpoint_path: Optional[str] = None,
+            checkpoint_every: int = 1) -> SimulationStats:
+        """继续模拟 n_casts 卦
+
+        Args:
+            n_casts: 本次模拟的卦数
+            checkpoint_path: 断点文件路径，给定时每 checkpoint_every 块保存一次
+            checkpoint_every: 保存断点的块间隔
+        """
+        if checkpoint_path:
+            self._checkpoint_method()
+        end = self.next_index + n_casts
+        chunks = 0
+        while self.next_index < end:
+            size = min(self.chunk_size, end - self.next_index)
+            self.stats.update(self.generator.generate_batch(size, start=self.next_index))
+            self.next_index += size
+            chunks += 1
+            if checkpoint_path and chunks % checkpoint_every == 0:
+                self.save_checkpoint(checkpoint_path)
+        if checkpoint_path:
+            self.save_checkpoint(checkpoint_path)
+        return self.stats
+
+    def run_parallel(self, n_casts: int, workers: Optional[int] = None) -> SimulationStats:
+        """用进程池继续模拟 n_casts 卦，各进程负责不相交的卦序号区间"""
+        workers = workers or os.cpu_count() or 1
+        share, extra = divmod(n_casts, workers)
+        ranges: List[tuple] = []
+        start = self.next_index
+        for i in range(workers):
+            size = share + (1 if i < extra else 0)
+            if size:
+                ranges.append((start, size))
+                start += size
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_simulate_range, self.seed, self.stream, self.generator.engine,
+                                range_start, size, self.chunk_size)
+                for range_start, size in ranges
+            ]
+            for future in futures:
+                self.stats.merge(future.result())
+
+        self.next_index = start
+        return self.stats
+
+    def save_checkpoint(self, path: str) -> None:
+        """保存断点（先写临时文件再替换，避免中断时损坏），仅支持已注册的起卦法"""
+        state = {
+            "seed": self.seed,
+            "stream": self.stream,
+            "method": self._checkpoint_method(),
+            "chunk_size": self.chunk_size,
+            "next_index": self.next_index,
+            "stats": self.stats.to_dict()
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def resume(cls, path: str) -> "CastSimulator":
+        """从断点恢复模拟器"""
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        simulator = cls(state["seed"], state["stream"], state["method"], state["chunk_size"])
+        simulator.next_index = state["next_index"]
+        simulator.stats = SimulationStats.from_dict(state["stats"])
+        return simulator
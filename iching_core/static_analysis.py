@@ -0,0 +1,152 @@
+"""静态分析数据包
+
+分析报告中只由 (本卦, 动爻掩码) 决定的部分，离线对全部 4096 种组合计算一次，
+按记录 code << 6 | mask、字段为段名编译为数据包（值为 JSON），
+运行时 HexagramAnalyzer 直接查表，只实时计算与时间相关的部分。
+
+值中的元组与共享只读记录（FrozenRecord）编码时加标记，解码时还原，
+查表结果与实时计算的值和类型一致；每段只解码一次，此后共用解码结果（调用方不应修改）。
+
+修改这些段的分析逻辑或编码方式后须递增 STATIC_ANALYSIS_VERSION 并重新构建；
+数据包缺失或版本不符时自动回退为实时计算。
+
+构建：python -m iching_core.static_analysis [输出路径]
+"""
+import functools
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.datapack import DATA_DIR, DataPack, build_pack, write_pack
+from iching_core.frozen_record import FrozenRecord
+
+STATIC_ANALYSIS_VERSION = 4
+STATIC_ANALYSIS_PATH = os.path.join(DATA_DIR, "static_analysis.bin")
+
+# 段名 -> HexagramAnalyzer 方法名
+STATIC_SECTIONS: Dict[str, str] = {
+    "yao_layout": "_get_yao_layout",
+    "dynamic_analysis": "_get_dynamic_analysis",
+    "hexagram_changes": "analyze_hexagram_changes",
+    "directions": "analyze_directions",
+    "trends": "predict_trends",
+    "wu_xing": "_analyze_wu_xing"
+}
+
+# 编码标记：{TUPLE_TAG: [...]} 还原为元组，{RECORD_TAG: {...}} 还原为 FrozenRecord
+TUPLE_TAG = "__tuple__"
+RECORD_TAG = "__record__"
+# 解码结果的缓存段数：每段解码后约 10KB，保留最近用到的 4096 段（约 45MB）
+DECODED_CACHE_SIZE = 4096
+
+_pack: Optional[DataPack] = None
+_pack_loaded = False
+_pack_lock = threading.Lock()
+
+def load_static_analysis(path: Optional[str] = None) -> Optional[DataPack]:
+    """加载静态分析数据包，文件不存在或版本、字段不符时返回 None"""
+    path = path or STATIC_ANALYSIS_PATH
+    if not os.path.exists(path):
+        return None
+    pack = DataPack.open(path)
+    if pack.data_version != STATIC_ANALYSIS_VERSION or pack.fields != list(STATIC_SECTIONS) \
+            or pack.record_count != 4096:
+        return None
+    return pack
+
+def encode_value(value: Any) -> str:
+    """将分析段的值编码为 JSON，元组与 FrozenRecord 加标记"""
+    return json.dumps(_tag(value), ensure_ascii=False, separators=(",", ":"))
+
+def decode_value(text: str) -> Any:
+    """解码 encode_value 的结果，还原元组与 FrozenRecord"""
+    return json.loads(text, object_hook=_untag)
+
+def _tag(value: Any) -> Any:
+    if isinstance(value, FrozenRecord):
+        return {RECORD_TAG: {key: _tag(item) for key, item in value.items()}}
+    if isinstance(value, Mapping):
+        return {key: _tag(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return {TUPLE_TAG: [_tag(item) for item in value]}
+    if isinstance(value, list):
+        return [_tag(item) for item in value]
+    return value
+
+def _untag(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        if TUPLE_TAG in obj:
+            return tuple(obj[TUPLE_TAG])
+        if RECORD_TAG in obj:
+            return FrozenRecord(obj[RECORD_TAG])
+    return obj
+
+@functools.lru_cache(maxsize=DECODED_CACHE_SIZE)
+def _decoded_section(pack: DataPack, record: int, section: str) -> Any:
+    """数据包中一段的解码结果，每段只解码一次"""
+    return decode_value(pack.get(record, section))
+
+def get_static_analysis() -> Optional[DataPack]:
+    """进程内共享的静态分析数据包（首次调用时加载）"""
+    global _pack, _pack_loaded
+    if not _pack_loaded:
+        with _pack_lock:
+            if not _pack_loaded:
+                _pack = load_static_analysis()
+                _pack_loaded = True
+    return _pack
+
+def static_analysis_state() -> Optional[bool]:
+    """数据包的当前状态，不触发加载：None 表示尚未加载，否则表示是否可用"""
+    return _pack is not None if _pack_loaded else None
+
+def set_static_analysis(pack: Optional[DataPack]) -> None:
+    """替换共享的静态分析数据包（None 表示关闭查表，全部实时计算）"""
+    global _pack, _pack_loaded
+    with _pack_lock:
+        _pack = pack
+        _pack_loaded = True
+    _decoded_section.cache_clear()
+
+def static_section(section: str) -> Callable:
+    """分析方法装饰器：数据包中有该段时直接返回查表结果"""
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            pack = get_static_analysis() if self.use_static else None
+            if pack is None or args or kwargs:
+                return method(self, *args, **kwargs)
+            return _decoded_section(pack, self.hexagram.code << 6 | self.hexagram.mask, section)
+        return wrapper
+    return decorator
+
+def build_static_analysis() -> bytes:
+    """对全部 4096 种 (本卦, 动爻) 组合计算静态分析段并编译为数据包"""
+    from models.hexagram import FrozenHexagram
+    from iching_core.hexagram_analyzer import HexagramAnalyzer
+
+    # 静态段与时间无关，任取一个时间即可
+    time = datetime(2000, 1, 1)
+    records = []
+    for code in range(64):
+        for mask in range(64):
+            analyzer = HexagramAnalyzer(FrozenHexagram(code, mask, time), use_static=False)
+            records.append({
+                section: encode_value(getattr(analyzer, method)())
+                for section, method in STATIC_SECTIONS.items()
+            })
+    return build_pack(records, list(STATIC_SECTIONS), STATIC_ANALYSIS_VERSION)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else STATIC_ANALYSIS_PATH
+    write_pack(path, build_static_analysis())
+    print(f"Static analysis pack has been saved to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, NamedTuple, Tuple, Union
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from iching_core.five_elements import FiveElements, RELATION_TYPES, RELATION_TYPE_INDEX
+
+# 天干
+HEAVENLY_STEMS = ["甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"]
+# 地支
+EARTHLY_BRANCHES = ["子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"]
+
+# 1970-01-01 的儒略日数
+UNIX_EPOCH_JDN = 2440588
+# 儒略日数加此偏移后除60的余数即日干支序号（0 为甲子）
+DAY_CYCLE_OFFSET = 49
+
+def day_cycle_index(day: Union[date, datetime]) -> int:
+    """日干支在六十甲子中的序号（0 为甲子），按公历日期计，不做子时换日"""
+    return (day.toordinal() + 1721425 + DAY_CYCLE_OFFSET) % 60
+
+def day_gan_zhi(day: Union[date, datetime]) -> Tuple[str, str]:
+    """日干支"""
+    index = day_cycle_index(day)
+    return HEAVENLY_STEMS[index % 10], EARTHLY_BRANCHES[index % 12]
+
+def day_cycle_indices(times) -> np.ndarray:
+    """批量计算日干支序号"""
+    days = np.asarray(times, dtype="datetime64[D]").astype(np.int64)
+    return (days + UNIX_EPOCH_JDN + DAY_CYCLE_OFFSET) % 60
+
+# 地支五行（按 EARTHLY_BRANCHES 顺序）
+BRANCH_ELEMENTS: Tuple[str, ...] = ("水", "土", "木", "木", "土", "火", "火", "土", "金", "金", "土", "水")
+# 月支所属季节：辰戌丑未为四季土月
+BRANCH_SEASONS: Tuple[str, ...] = ("冬", "四季", "春", "春", "四季", "夏", "夏", "四季", "秋", "秋", "四季", "冬")
+
+# 二十四节气，自立春起，太阳视黄经每 15° 一个
+SOLAR_TERMS: Tuple[str, ...] = (
+    "立春", "雨水", "惊蛰", "春分", "清明", "谷雨", "立夏", "小满", "芒种", "夏至", "小暑", "大暑",
+    "立秋", "处暑", "白露", "秋分", "寒露", "霜降", "立冬", "小雪", "大雪", "冬至", "小寒", "大寒"
+)
+# 立春的太阳视黄经（度）
+LICHUN_LONGITUDE = 315.0
+# 节气按北京时间划分，不带时区的时间视为北京时间
+BEIJING_UTC_OFFSET_HOURS = 8
+# J2000.0 的儒略日
+J2000_JD = 2451545.0
+
+# 旺相休囚死及各自的力量系数
+SEASONAL_STATES: Tuple[str, ...] = ("旺", "相", "休", "囚", "死")
+SEASONAL_STATE_STRENGTHS: Tuple[float, ...] = (1.0, 0.8, 0.5, 0.3, 0.1)
+# 以月令五行为主：同我者旺、我生者相、生我者休、克我者囚、我克者死（按 RELATION_TYPES 的类型名）
+RELATION_STATES: Dict[str, str] = {"同类": "旺", "生": "相", "泄": "休", "化": "囚", "克": "死"}
+
+def _seasonal_tables() -> Tuple[np.ndarray, ...]:
+    """按节气、月支索引的旺衰表，五行序号按 FiveElements.ELEMENTS"""
+    element_index = FiveElements.ELEMENT_INDEX
+    # 节气 -> 月支：立春、雨水属寅月，此后每两个节气一个月
+    term_branches = np.array([(2 + term // 2) % 12 for term in range(24)], dtype=np.uint8)
+    # 关系类型 -> 旺衰状态
+    state_of_relation = np.zeros(len(RELATION_TYPES), dtype=np.uint8)
+    for relation_type, state in RELATION_STATES.items():
+        state_of_relation[RELATION_TYPE_INDEX[relation_type]] = SEASONAL_STATES.index(state)
+    ruling = np.array([element_index[element] for element in BRANCH_ELEMENTS], dtype=np.intp)
+    # [五行][月支]：月令五行对该五行的关系决定旺衰
+    branch_states = state_of_relation[FiveElements.RELATION_MATRIX.type_id[ruling].T]
+    term_states = branch_states[:, term_branches]
+    term_strengths = np.array(SEASONAL_STATE_STRENGTHS)[term_states]
+    favorable = term_states <= SEASONAL_STATES.index("相")
+    tables = (term_branches, branch_states, term_states, term_strengths, favorable)
+    for table in tables:
+        table.flags.writeable = False
+    return tables
+
+# MONTH_BRANCH_BY_TERM: 节气序号 -> 月支序号
+# BRANCH_STATE_TABLE: 5×12 [五行][月支] -> 旺衰序号
+# SEASONAL_STATE_TABLE / SEASONAL_STRENGTH_TABLE / SEASONAL_FAVORABLE_TABLE:
+#     5×24 [五行][节气] -> 旺衰序号 / 力量系数 / 是否旺相
+MONTH_BRANCH_BY_TERM, BRANCH_STATE_TABLE, SEASONAL_STATE_TABLE, SEASONAL_STRENGTH_TABLE, \
+    SEASONAL_FAVORABLE_TABLE = _seasonal_tables()
+
+class SeasonInfo(NamedTuple):
+    """一个节气的月令与五行旺衰"""
+    solar_term: str  # 节气
+    month_branch: str  # 月支
+    season: str  # 季节
+    ruling_element: str  # 月令五行
+    states: Tuple[str, ...]  # 各五行的旺衰，按 FiveElements.ELEMENTS
+    strengths: Tuple[float, ...]  # 各五行的力量系数
+
+def _season_info(term: int) -> SeasonInfo:
+    branch = int(MONTH_BRANCH_BY_TERM[term])
+    return SeasonInfo(
+        SOLAR_TERMS[term],
+        EARTHLY_BRANCHES[branch],
+        BRANCH_SEASONS[branch],
+        BRANCH_ELEMENTS[branch],
+        tuple(SEASONAL_STATES[state] for state in SEASONAL_STATE_TABLE[:, term].tolist()),
+        tuple(SEASONAL_STRENGTH_TABLE[:, term].tolist())
+    )
+
+# 节气序号 -> 月令与旺衰
+SEASON_TABLE: Tuple[SeasonInfo, ...] = tuple(_season_info(term) for term in range(24))
+
+def _solar_longitude(days):
+    """太阳视黄经（度），参数为距 J2000.0 的日数（标量或数组）
+
+    低精度公式（Meeus《天文算法》第 25 章），误差约 0.01°，即交节时刻误差在十余分钟内；
+    不计 ΔT。标量与数组共用同一组运算，np.sin 对标量同样适用。
+    """
+    t = days / 36525
+    mean_longitude = 280.46646 + 36000.76983 * t + 0.0003032 * t * t
+    anomaly = np.radians(357.52911 + 35999.05029 * t - 0.0001537 * t * t)
+    center = (1.914602 - 0.004817 * t - 0.000014 * t * t) * np.sin(anomaly) \
+        + (0.019993 - 0.000101 * t) * np.sin(2 * anomaly) + 0.000289 * np.sin(3 * anomaly)
+    node = np.radians(125.04 - 1934.136 * t)
+    return (mean_longitude + center - 0.00569 - 0.00478 * np.sin(node)) % 360
+
+def solar_term_index(time: Union[date, datetime]) -> int:
+    """所在节气的序号（0 为立春），不带时区的时间按北京时间计"""
+    if not isinstance(time, datetime):
+        time = datetime(time.year, time.month, time.day)
+    if time.tzinfo is not None:
+        time = time.astimezone(timezone.utc).replace(tzinfo=None) + timedelta(hours=BEIJING_UTC_OFFSET_HOURS)
+    days = (time - datetime(2000, 1, 1, 12 + BEIJING_UTC_OFFSET_HOURS)).total_seconds() / 86400
+    return int((_solar_longitude(days) - LICHUN_LONGITUDE) % 360 // 15)
+
+def solar_term_indices(times, utc_offset_hours: float = BEIJING_UTC_OFFSET_HOURS) -> np.ndarray:
+    """批量计算节气序号
+
+    Args:
+        times: datetime64 数组（或可转换的时间序列）
+        utc_offset_hours: 时间所在时区与 UTC 的时差（小时）
+    """
+    seconds = np.asarray(times, dtype="datetime64[s]").astype(np.int64)
+    days = (seconds - utc_offset_hours * 3600) / 86400 + (UNIX_EPOCH_JDN - 0.5 - J2000_JD)
+    return ((_solar_longitude(days) - LICHUN_LONGITUDE) % 360 // 15).astype(np.intp)
+
+def month_branch_index(time: Union[date, datetime]) -> int:
+    """月支序号（以节令交月，立春起寅月）"""
+    return int(MONTH_BRANCH_BY_TERM[solar_term_index(time)])
+
+def season_info(time: Union[date, datetime]) -> SeasonInfo:
+    """时间所在节气的月令与五行旺衰"""
+    return SEASON_TABLE[solar_term_index(time)]
+
+def seasonal_state(element: str, time: Union[date, datetime]) -> str:
+    """五行在该时间的旺衰"""
+    return season_info(time).states[FiveElements.ELEMENT_INDEX[element]]
+
+def seasonal_strengths(times, utc_offset_hours: float = BEIJING_UTC_OFFSET_HOURS) -> np.ndarray:
+    """批量计算五行力量系数，返回 (n, 5)，列按 FiveElements.ELEMENTS
+
+    例如一年逐小时：seasonal_strengths(np.arange("2025", "2026", dtype="datetime64[h]"))
+    """
+    return SEASONAL_STRENGTH_TABLE[:, solar_term_indices(times, utc_offset_hours)].T
+
+def seasonal_state_indices(times, utc_offset_hours: float = BEIJING_UTC_OFFSET_HOURS) -> np.ndarray:
+    """批量计算五行旺衰序号（SEASONAL_STATES），返回 (n, 5)，列按 FiveElements.ELEMENTS"""
+    return SEASONAL_STATE_TABLE[:, solar_term_indices(times, utc_offset_hours)].T
@@ -1,5 +1,12 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Mapping, NamedTuple, Sequence, Tuple
 from enum import Enum
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.hexagram import TRIGRAM_NAMES, TRIGRAM_LINES
+from iching_core.five_elements import FiveElements
+from iching_core.casting import XIANTIAN_TRIGRAMS
 
 class TrigramNature(Enum):
     """八卦性质枚举"""
@@ -11,6 +18,45 @@ class TrigramPosition(Enum):
     UPPER = "上卦"
     LOWER = "下卦"
 
+class TrigramInfo(NamedTuple):
+    """按三位卦码索引的八卦记录"""
+    code: int  # 三位卦码（初爻为最低位）
+    name: str  # 卦名
+    lines: Tuple[int, ...]  # 三爻（自下而上）
+    element: str  # 五行
+    nature: TrigramNature  # 阴阳
+    number: int  # 先天八卦数
+    attributes: Mapping  # TRIGRAM_DATA 中的完整属性
+
+def _build_trigram_table(data: Dict[str, Dict]) -> Tuple[TrigramInfo, ...]:
+    """按三位卦码构建八卦表，并与各模块的八卦数据逐项核对
+
+    卦码布局、八卦五行、先天八卦数分别由 models.hexagram、FiveElements、casting 定义，
+    任一处不一致即在导入时抛出 ValueError，避免带着错误数据启动。
+    """
+    if set(data) != set(TRIGRAM_NAMES):
+        raise ValueError(f"Trigram names mismatch: {sorted(data)}")
+    errors = []
+    table = []
+    for code, name in enumerate(TRIGRAM_NAMES):
+        trigram = data[name]
+        lines = TRIGRAM_LINES[code]
+        # 阳卦多阴、阴卦多阳：阳爻数为奇数者为阳卦
+        nature = TrigramNature.YANG if sum(lines) % 2 else TrigramNature.YIN
+        if tuple(trigram["卦象"]) != lines:
+            errors.append(f"{name} lines {trigram['卦象']} != {list(lines)}")
+        if trigram["性质"] is not nature:
+            errors.append(f"{name} nature {trigram['性质'].value} != {nature.value}")
+        elements = {trigram["五行"], FiveElements.TRIGRAM_ELEMENT_TABLE[code], FiveElements.TRIGRAM_ELEMENTS[name]}
+        if len(elements) > 1:
+            errors.append(f"{name} element {sorted(elements)}")
+        if XIANTIAN_TRIGRAMS[trigram["数字"] % 8] != code:
+            errors.append(f"{name} number {trigram['数字']}")
+        table.append(TrigramInfo(code, name, lines, trigram["五行"], nature, trigram["数字"], trigram))
+    if errors:
+        raise ValueError("Inconsistent trigram tables: " + "; ".join(errors))
+    return tuple(table)
+
 class Trigrams:
     """八卦基础类"""
     
@@ -24,7 +70,7 @@ class Trigrams:
             "动物": "马",
             "人伦": "父",
             "身体": "头",
-            "卦象": [1, 1, 1],  # 1表示阳爻，0表示阴爻
+            "卦象": [1, 1, 1],  # 自初爻而上，1表示阳爻，0表示阴爻
             "特性": ["刚健", "君子", "创造"],
             "含义": "刚健中正，充满活力，具有领导才能",
             "吉凶": "大吉",
@@ -75,7 +121,7 @@ class Trigrams:
             "动物": "龙",
             "人伦": "长男",
             "身体": "足",
-            "卦象": [0, 0, 1],
+            "卦象": [1, 0, 0],
             "特性": ["动", "起", "振发"],
             "含义": "雷厉风行，震撼奋起，具有决断力",
             "吉凶": "吉凶参半",
@@ -92,7 +138,7 @@ class Trigrams:
             "动物": "鸡",
             "人伦": "长女",
             "身体": "股",
-            "卦象": [1, 1, 0],
+            "卦象": [0, 1, 1],
             "特性": ["入", "巽", "顺从"],
             "含义": "谦逊温和，随风潜入，具有适应性",
             "吉凶": "吉",
@@ -126,7 +172,7 @@ class Trigrams:
             "动物": "狗",
             "人伦": "少男",
             "身体": "手",
-            "卦象": [1, 0, 0],
+            "卦象": [0, 0, 1],
             "特性": ["止", "静", "安定"],
             "含义": "稳重安静，不轻举妄动，具有耐性",
             "吉凶": "吉",
@@ -154,6 +200,12 @@ class Trigrams:
         }
     }
 
+    # 三位卦码 -> 八卦记录，导入时构建并核对
+    TRIGRAM_TABLE = _build_trigram_table(TRIGRAM_DATA)
+
+    # 三爻（自下而上）-> 三位卦码
+    LINES_CODES = {lines: code for code, lines in enumerate(TRIGRAM_LINES)}
+
     # 汉字部首与五行对应关系
     RADICALS = {
         "金": {
@@ -222,12 +274,12 @@ class Trigrams:
         return cls.TRIGRAM_DATA[trigram_name]
 
     @classmethod
-    def get_trigram_by_lines(cls, lines: List[int]) -> str:
-        """根据爻线获取八卦名"""
-        for name, data in cls.TRIGRAM_DATA.items():
-            if data["卦象"] == lines:
-                return name
-        raise ValueError(f"Invalid trigram lines: {lines}")
+    def get_trigram_by_lines(cls, lines: Sequence[int]) -> str:
+        """根据爻线（自下而上）获取八卦名"""
+        code = cls.LINES_CODES.get(tuple(lines))
+        if code is None:
+            raise ValueError(f"Invalid trigram lines: {lines}")
+        return cls.TRIGRAM_TABLE[code].name
 
     @classmethod
     def get_trigram_relations(cls, trigram1: str, trigram2: str) -> Dict:
@@ -237,9 +289,13 @@ class Trigrams:
         
         relations = []
         
-        # 检查五行关系
-        if t1["五行"] == t2["五行"]:
+        # 检查五行关系：同行、生、泄为相生，克、化为相克
+        element_relation = FiveElements.relation_type(t1["五行"], t2["五行"])
+        if element_relation == "同类":
             relations.append(("五行", "同行", "相生"))
+        else:
+            nature = "相克" if element_relation in ("克", "化") else "相生"
+            relations.append(("五行", element_relation, nature))
         
         # 检查方位关系
         directions = ["东", "南", "西", "北"]
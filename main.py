@@ -18,6 +18,9 @@ def parse_args():
                       help='Analysis template type')
     return parser.parse_args()
 
+# 报告用到的分析段
+MARKDOWN_SECTIONS = ['basic_info', 'hexagram_info', 'relationships', 'recommendations']
+
 def generate_markdown(analysis_result: dict, template_type: str) -> str:
     """根据分析结果生成Markdown格式报告"""
     
@@ -157,7 +160,7 @@ def main():
     
     # 分析卦象
     analyzer = HexagramAnalyzer(hexagram)
-    analysis_result = analyzer.generate_analysis()
+    analysis_result = analyzer.generate_analysis(MARKDOWN_SECTIONS)
     
     # 生成报告
     report = generate_markdown(analysis_result, args.template)
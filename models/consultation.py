@@ -1,6 +1,6 @@
 from typing import Dict, Optional
 from datetime import datetime
-from .hexagram import Hexagram
+from .hexagram import Hexagram, FrozenHexagram
 
 class Consultation:
     def __init__(self):
@@ -19,13 +19,20 @@ class Consultation:
             "id": self.id,
             "category": self.category,
             "question": self.question,
-            "hexagram": self.hexagram.__dict__,
-            "changed_hexagram": self.changed_hexagram.__dict__ if self.changed_hexagram else None,
+            "hexagram": self._hexagram_dict(self.hexagram),
+            "changed_hexagram": self._hexagram_dict(self.changed_hexagram) if self.changed_hexagram else None,
             "analysis": self.analysis,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat()
         }
     
+    @staticmethod
+    def _hexagram_dict(hexagram) -> Dict:
+        """卦象字段字典（紧凑卦象先还原为 Hexagram）"""
+        if isinstance(hexagram, FrozenHexagram):
+            hexagram = hexagram.thaw()
+        return hexagram.__dict__
+    
     @classmethod
     def from_dict(cls, data: Dict) -> 'Consultation':
         """从字典创建咨询记录实例"""
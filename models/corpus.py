@@ -0,0 +1,131 @@
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Mapping, Optional, Sequence
+
+from .datapack import HEXAGRAM_INFO_FIELDS, DataPack, load_hexagram_pack
+
+class ShardedCorpus:
+    """按卦分片的文本语料
+
+    数据包在首次访问时才加载；每卦为一个分片，首次访问时整体解码，
+    解码结果保存在有界 LRU 中。分片结构：
+        info    卦名、卦辞等基本信息（只读映射）
+        yao     爻辞，键为爻位 1-6（只读映射）
+        其余字段（如彖传、象传）按字段名直接保存
+    """
+
+    def __init__(self, name: str, loader: Callable[[], DataPack], maxsize: int = 32):
+        self.name = name
+        self.maxsize = maxsize
+        self._loader = loader
+        self._pack: Optional[DataPack] = None
+        self._shards: "OrderedDict[int, Mapping]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def pack(self) -> DataPack:
+        """语料数据包（按需加载）"""
+        if self._pack is None:
+            with self._lock:
+                if self._pack is None:
+                    self._pack = self._loader()
+        return self._pack
+
+    def shard(self, code: int) -> Mapping:
+        """获取一卦的分片"""
+        with self._lock:
+            shard = self._shards.get(code)
+            if shard is not None:
+                self._shards.move_to_end(code)
+                self.hits += 1
+                return shard
+        shard = self._decode(code)
+        with self._lock:
+            self.misses += 1
+            self._shards[code] = shard
+            self._shards.move_to_end(code)
+            while len(self._shards) > self.maxsize:
+                self._shards.popitem(last=False)
+                self.evictions += 1
+        return shard
+
+    def prewarm(self, codes: Optional[Iterable[int]] = None) -> None:
+        """预先解码分片（缺省为全部），并保证缓存容量足以容纳"""
+        codes = list(range(self.pack.record_count) if codes is None else codes)
+        self.maxsize = max(self.maxsize, len(codes))
+        for code in codes:
+            self.shard(code)
+
+    def clear(self) -> None:
+        """清空已解码的分片"""
+        with self._lock:
+            self._shards.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """缓存统计"""
+        return {
+            "size": len(self._shards),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+    def _decode(self, code: int) -> Mapping:
+        pack = self.pack
+        info = {}
+        yao = {}
+        shard = {}
+        for field in pack.fields:
+            value = pack.get(code, field)
+            if not value:
+                continue
+            if field in HEXAGRAM_INFO_FIELDS:
+                info[field] = value
+            elif field.startswith("yao_"):
+                yao[int(field[4:])] = value
+            else:
+                shard[field] = value
+        shard["info"] = MappingProxyType(info)
+        shard["yao"] = MappingProxyType(yao)
+        return MappingProxyType(shard)
+
+class ShardTable(Sequence):
+    """按卦码索引语料分片中的某一部分（如 info、yao）"""
+
+    def __init__(self, corpus: ShardedCorpus, part: str):
+        self._corpus = corpus
+        self._part = part
+
+    def __getitem__(self, code: int) -> Mapping:
+        if not 0 <= code < 64:
+            raise IndexError(f"Invalid hexagram code: {code}")
+        return self._corpus.shard(code)[self._part]
+
+    def __len__(self) -> int:
+        return 64
+
+# 已注册的语料
+CORPORA: Dict[str, ShardedCorpus] = {
+    "texts": ShardedCorpus("texts", load_hexagram_pack)
+}
+
+def get_corpus(name: str = "texts") -> ShardedCorpus:
+    """按名称获取语料"""
+    if name not in CORPORA:
+        raise ValueError(f"Invalid corpus: {name}")
+    return CORPORA[name]
+
+def register_corpus(corpus: ShardedCorpus) -> ShardedCorpus:
+    """注册语料（如彖传、象传、译文等数据包）"""
+    CORPORA[corpus.name] = corpus
+    return corpus
+
+def prewarm(names: Optional[Iterable[str]] = None) -> None:
+    """预热语料，供对延迟敏感的服务在启动时调用"""
+    for name in (CORPORA if names is None else names):
+        get_corpus(name).prewarm()
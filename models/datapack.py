@@ -0,0 +1,126 @@
+"""二进制数据包
+
+将按卦码（或其他整数编号）索引的文本表编译为只读二进制文件，
+运行时通过 mmap 映射，多个进程共享操作系统页缓存，查询时只解码所需字段。
+
+文件格式（小端）：
+    头部      magic(4s) 格式版本(H) 字段数(H) 记录数(I) 数据版本(I) 字段名长度(I)
+    字段名    UTF-8，以换行分隔
+    索引      记录数 × 字段数 × (偏移 I, 长度 I)，偏移相对于文本区起点
+    文本区    UTF-8 字符串依次拼接
+
+构建：python -m models.datapack [输出路径]
+"""
+import mmap
+import os
+import struct
+import sys
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+
+MAGIC = b"ICHP"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sHHIII")
+INDEX_ENTRY = struct.Struct("<II")
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+HEXAGRAM_PACK_PATH = os.path.join(DATA_DIR, "hexagram_pack.bin")
+
+# 卦辞、爻辞数据包的字段与数据版本（修改 hexagram_texts 后递增）
+HEXAGRAM_INFO_FIELDS = ["name", "meaning", "description", "nature"]
+HEXAGRAM_FIELDS = HEXAGRAM_INFO_FIELDS + ["yao_1", "yao_2", "yao_3", "yao_4", "yao_5", "yao_6"]
+HEXAGRAM_DATA_VERSION = 1
+
+class DataPack:
+    """只读数据包"""
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]):
+        magic, format_version, field_count, record_count, data_version, names_size = \
+            HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Invalid data pack")
+        if format_version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported data pack format: {format_version}")
+        self._buffer = buffer
+        self.data_version = data_version
+        self.record_count = record_count
+        names_start = HEADER.size
+        self.fields: List[str] = bytes(buffer[names_start:names_start + names_size]).decode("utf-8").split("\n")
+        if len(self.fields) != field_count:
+            raise ValueError("Corrupted data pack field names")
+        self.field_index: Dict[str, int] = {name: i for i, name in enumerate(self.fields)}
+        self._index_start = names_start + names_size
+        self._text_start = self._index_start + record_count * field_count * INDEX_ENTRY.size
+
+    @classmethod
+    def open(cls, path: str) -> "DataPack":
+        """以 mmap 方式打开数据包文件"""
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+
+    def get(self, record: int, field: str) -> str:
+        """读取并解码单个字段"""
+        if not 0 <= record < self.record_count:
+            raise IndexError(f"Invalid record: {record}")
+        entry = self._index_start + (record * len(self.fields) + self.field_index[field]) * INDEX_ENTRY.size
+        offset, length = INDEX_ENTRY.unpack_from(self._buffer, entry)
+        if not length:
+            return ""
+        start = self._text_start + offset
+        return bytes(self._buffer[start:start + length]).decode("utf-8")
+
+def build_pack(records: Sequence[Mapping[str, str]], fields: Sequence[str], data_version: int = 0) -> bytes:
+    """将记录编译为数据包字节串"""
+    names = "\n".join(fields).encode("utf-8")
+    index = bytearray()
+    text = bytearray()
+    for record in records:
+        for field in fields:
+            encoded = (record.get(field) or "").encode("utf-8")
+            index += INDEX_ENTRY.pack(len(text), len(encoded))
+            text += encoded
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(fields), len(records), data_version, len(names))
+    return bytes(header + names + index + text)
+
+def write_pack(path: str, data: bytes) -> None:
+    """写入数据包文件（先写临时文件再替换，避免读到半成品）"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+def build_hexagram_pack() -> bytes:
+    """由 hexagram_texts 源数据编译卦辞、爻辞数据包"""
+    from .hexagram import HEXAGRAM_KEYS
+    from .hexagram_texts import HEXAGRAM_DATA, YAO_TEXT
+
+    records = []
+    for key in HEXAGRAM_KEYS:
+        record = dict(HEXAGRAM_DATA.get(key, {}))
+        for line, text in YAO_TEXT.get(key, {}).items():
+            record[f"yao_{line}"] = text
+        records.append(record)
+    return build_pack(records, HEXAGRAM_FIELDS, HEXAGRAM_DATA_VERSION)
+
+def load_hexagram_pack(path: Optional[str] = None) -> DataPack:
+    """加载卦辞、爻辞数据包
+
+    优先映射已构建的文件；文件不存在或版本不符时在内存中由源数据构建。
+    """
+    path = path or HEXAGRAM_PACK_PATH
+    if os.path.exists(path):
+        pack = DataPack.open(path)
+        if pack.data_version == HEXAGRAM_DATA_VERSION and pack.fields == HEXAGRAM_FIELDS:
+            return pack
+    return DataPack(build_hexagram_pack())
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else HEXAGRAM_PACK_PATH
+    write_pack(path, build_hexagram_pack())
+    print(f"Hexagram data pack has been saved to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,85 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterable, Mapping, NamedTuple, Sequence
 from datetime import datetime
 
+from .corpus import ShardTable, get_corpus
+
+# 八卦按三位二进制编码：初爻为最低位，阳爻为1
+TRIGRAM_NAMES: List[str] = ["坤", "震", "坎", "兑", "艮", "离", "巽", "乾"]
+TRIGRAM_INDEX: Dict[str, int] = {name: index for index, name in enumerate(TRIGRAM_NAMES)}
+# 三位卦码 -> 三爻（自下而上）
+TRIGRAM_LINES: Tuple[Tuple[int, ...], ...] = tuple(tuple(code >> i & 1 for i in range(3)) for code in range(8))
+
+def encode_lines(lines: Iterable[int]) -> int:
+    """六爻（自下而上）编码为卦码 0-63"""
+    code = 0
+    for position, line in enumerate(lines):
+        if line:
+            code |= 1 << position
+    return code
+
+def encode_mask(changing_lines: Iterable[int]) -> int:
+    """动爻位置（0-5）编码为六位掩码"""
+    mask = 0
+    for position in changing_lines:
+        mask |= 1 << position
+    return mask
+
+def hexagram_code(lower: str, upper: str) -> int:
+    """由上下卦名得到卦码"""
+    return TRIGRAM_INDEX[upper] << 3 | TRIGRAM_INDEX[lower]
+
+# 卦码 -> 六爻 / 掩码 -> 动爻位置
+LINES_TABLE: List[Tuple[int, ...]] = [tuple(code >> i & 1 for i in range(6)) for code in range(64)]
+MASK_POSITIONS: List[Tuple[int, ...]] = [tuple(i for i in range(6) if mask >> i & 1) for mask in range(64)]
+
+# 卦码 -> 卦名键（上卦_下卦，与 HEXAGRAM_DATA 一致）
+HEXAGRAM_KEYS: List[str] = [f"{TRIGRAM_NAMES[code >> 3]}_{TRIGRAM_NAMES[code & 7]}" for code in range(64)]
+
+# 卦码 -> （下卦名, 上卦名）
+TRIGRAM_PAIRS: List[Tuple[str, str]] = [(TRIGRAM_NAMES[code & 7], TRIGRAM_NAMES[code >> 3]) for code in range(64)]
+
+# 八宫世代：本宫卦依次变动的爻（掩码），游魂还原四爻，归魂再还原内卦
+GENERATION_NAMES: Tuple[str, ...] = ("本宫", "一世", "二世", "三世", "四世", "五世", "游魂", "归魂")
+GENERATION_MASKS: Tuple[int, ...] = (0b000000, 0b000001, 0b000011, 0b000111, 0b001111, 0b011111, 0b010111, 0b010000)
+
+def _palace_tables() -> Tuple[List[int], List[int]]:
+    """按京房八宫构建 卦码 -> 宫位、卦码 -> 世代 两张表"""
+    palace = [0] * 64
+    generation = [0] * 64
+    for trigram in range(8):
+        pure = trigram << 3 | trigram
+        for index, mask in enumerate(GENERATION_MASKS):
+            palace[pure ^ mask] = trigram
+            generation[pure ^ mask] = index
+    return palace, generation
+
+# 卦码 -> 宫位（八卦三位编码）/ 世代（GENERATION_NAMES 序号）
+PALACE_TABLE, GENERATION_TABLE = _palace_tables()
+
+class Transformation(NamedTuple):
+    """本卦经动爻变化后的结果"""
+    changed_code: int  # 变卦编码
+    changed_trigrams: Tuple[str, str]  # 变卦（下卦, 上卦）
+    palace: str  # 本卦所属宫
+
+# 变卦转换表：按 code << 6 | mask 索引，导入时构建一次
+TRANSFORM_TABLE: List[Transformation] = [
+    Transformation(code ^ mask, TRIGRAM_PAIRS[code ^ mask], TRIGRAM_NAMES[PALACE_TABLE[code]])
+    for code in range(64)
+    for mask in range(64)
+]
+
+def transform(code: int, mask: int) -> Transformation:
+    """查询本卦在给定动爻掩码下的变卦与宫位"""
+    return TRANSFORM_TABLE[code << 6 | mask]
+
 class Hexagram:
     def __init__(self):
         self.name: str = ""  # 本卦名
         self.changed_name: str = ""  # 变卦名
+        self.code: int = 0  # 本卦编码（0-63，初爻为最低位）
+        self.changed_code: int = 0  # 变卦编码
+        self.mask: int = 0  # 动爻掩码（0-63）
         self.lines: List[int] = []  # 爻列表
         self.changing_lines: List[int] = []  # 动爻位置
         self.time: datetime = datetime.now()  # 起卦时间
@@ -17,383 +92,155 @@ class Hexagram:
         self.terrestrial_branch: str = ""  # 地支
         self.six_relatives: List[str] = []  # 六亲
         self.six_spirits: List[str] = []  # 六神
+        self.seed: int = 0  # 随机种子
+        self.stream: int = 0  # 随机流编号
+        self.cast_index: int = 0  # 随机流中的卦序号
+        self.method: str = "coin"  # 起卦法
+
+    def freeze(self) -> "FrozenHexagram":
+        """转换为不可变的紧凑卦象"""
+        return FrozenHexagram(
+            self.code, self.mask, self.time, self.topic,
+            (self.seed, self.stream, self.cast_index, self.method)
+        )
+
+class FrozenHexagram:
+    """不可变的紧凑卦象
+
+    只保存卦码、动爻掩码、时间、主题和起卦来源，
+    其余字段（含纳甲干支）通过属性查表得到，属性名与 Hexagram 一致。
+    可哈希，可直接作为缓存键。
+    """
+
+    __slots__ = ("code", "mask", "time", "topic", "origin")
+
+    def __init__(self, code: int, mask: int, time: datetime, topic: str = "",
+                 origin: Tuple = (0, 0, 0, "coin")):
+        if not (0 <= code < 64 and 0 <= mask < 64):
+            raise ValueError(f"Invalid hexagram code or mask: {code}, {mask}")
+        setter = object.__setattr__
+        setter(self, "code", code)
+        setter(self, "mask", mask)
+        setter(self, "time", time)
+        setter(self, "topic", topic)
+        setter(self, "origin", tuple(origin))  # (seed, stream, cast_index, method)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"FrozenHexagram is immutable: {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"FrozenHexagram is immutable: {name}")
+
+    def __reduce__(self):
+        return (FrozenHexagram, (self.code, self.mask, self.time, self.topic, self.origin))
+
+    def _key(self) -> Tuple:
+        return (self.code, self.mask, self.time, self.topic, self.origin)
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenHexagram):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"FrozenHexagram(code={self.code}, mask={self.mask}, time={self.time!r}, topic={self.topic!r})"
+
+    @property
+    def name(self) -> str:
+        return HEXAGRAM_KEYS[self.code]
+
+    @property
+    def changed_code(self) -> int:
+        return TRANSFORM_TABLE[self.code << 6 | self.mask].changed_code
+
+    @property
+    def changed_name(self) -> str:
+        return HEXAGRAM_KEYS[self.changed_code]
+
+    @property
+    def lines(self) -> Tuple[int, ...]:
+        return LINES_TABLE[self.code]
+
+    @property
+    def changing_lines(self) -> Tuple[int, ...]:
+        return MASK_POSITIONS[self.mask]
+
+    @property
+    def gong(self) -> str:
+        return TRANSFORM_TABLE[self.code << 6 | self.mask].palace
+
+    @property
+    def original_trigrams(self) -> Tuple[str, str]:
+        return TRIGRAM_PAIRS[self.code]
+
+    @property
+    def changed_trigrams(self) -> Tuple[str, str]:
+        return TRANSFORM_TABLE[self.code << 6 | self.mask].changed_trigrams
+
+    # 纳甲干支、日干支、六亲、六神查 iching_core 中的表，按需导入以免循环导入
+
+    @property
+    def gan_zhi(self) -> Tuple[str, ...]:
+        from iching_core.relationship_analyzer import najia
+        return najia(self.code).gan_zhi
+
+    @property
+    def celestial_stem(self) -> str:
+        from iching_core.time_calculator import day_gan_zhi
+        return day_gan_zhi(self.time)[0]
+
+    @property
+    def terrestrial_branch(self) -> str:
+        from iching_core.time_calculator import day_gan_zhi
+        return day_gan_zhi(self.time)[1]
+
+    @property
+    def six_relatives(self) -> Tuple[str, ...]:
+        from iching_core.relationship_analyzer import six_relatives
+        return six_relatives(self.code)
+
+    @property
+    def six_spirits(self) -> Tuple[str, ...]:
+        from iching_core.relationship_analyzer import day_six_spirits
+        return day_six_spirits(self.time)
+
+    @property
+    def seed(self) -> int:
+        return self.origin[0]
+
+    @property
+    def stream(self) -> int:
+        return self.origin[1]
+
+    @property
+    def cast_index(self) -> int:
+        return self.origin[2]
+
+    @property
+    def method(self) -> str:
+        return self.origin[3]
+
+    def thaw(self) -> Hexagram:
+        """转换为可修改的 Hexagram"""
+        hexagram = Hexagram()
+        for field in ("name", "changed_name", "code", "changed_code", "mask", "time", "topic",
+                      "gong", "original_trigrams", "changed_trigrams", "celestial_stem",
+                      "terrestrial_branch", "seed", "stream", "cast_index", "method"):
+            setattr(hexagram, field, getattr(self, field))
+        for field in ("lines", "changing_lines", "gan_zhi", "six_relatives", "six_spirits"):
+            setattr(hexagram, field, list(getattr(self, field)))
+        return hexagram
+
+# 卦辞、爻辞按卦码直接索引：数据包在首次访问时才映射，每卦分片解码后由 LRU 缓存
+HEXAGRAM_TABLE: Sequence[Mapping[str, str]] = ShardTable(get_corpus("texts"), "info")
+YAO_TABLE: Sequence[Mapping[int, str]] = ShardTable(get_corpus("texts"), "yao")
 
-HEXAGRAM_DATA: Dict[str, Dict] = {
-    "乾_乾": {
-        "name": "乾为天",
-        "meaning": "纯阳",
-        "description": "元亨利贞",
-        "nature": "刚健中正"
-    },
-    "坤_坤": {
-        "name": "坤为地",
-        "meaning": "纯阴",
-        "description": "元亨利牝马之贞",
-        "nature": "柔顺中正"
-    },
-    "震_乾": {
-        "name": "震天雷",
-        "meaning": "雷天大壮",
-        "description": "利见大人",
-        "nature": "刚健奋进"
-    },
-    "坤_震": {
-        "name": "地雷复",
-        "meaning": "返归复始",
-        "description": "先迷后得",
-        "nature": "反复无常"
-    },
-    "坎_乾": {
-        "name": "水天需",
-        "meaning": "待时而动",
-        "description": "有孚光亨",
-        "nature": "谦逊等待"
-    },
-    "乾_坎": {
-        "name": "天水讼",
-        "meaning": "争讼",
-        "description": "有孚窒惕",
-        "nature": "慎重决断"
-    },
-    "艮_乾": {
-        "name": "山天大畜",
-        "meaning": "止而不止",
-        "description": "利贞不家食吉",
-        "nature": "蓄养待时"
-    },
-    "乾_艮": {
-        "name": "天山遁",
-        "meaning": "遁世离俗",
-        "description": "小利贞",
-        "nature": "韬光养晦"
-    },
-    "离_乾": {
-        "name": "火天大有",
-        "meaning": "丰盛光明",
-        "description": "元亨",
-        "nature": "光明盛大"
-    },
-    "乾_离": {
-        "name": "天火同人",
-        "meaning": "上下和同",
-        "description": "同人于野亨",
-        "nature": "和顺共济"
-    },
-    "兑_乾": {
-        "name": "泽天夬",
-        "meaning": "决断果断",
-        "description": "扬于王庭",
-        "nature": "刚决果断"
-    },
-    "乾_兑": {
-        "name": "天泽履",
-        "meaning": "脚踏实地",
-        "description": "履虎尾不咥人",
-        "nature": "谨慎踏实"
-    },
-    "震_坤": {
-        "name": "雷地豫",
-        "meaning": "顺势而动",
-        "description": "利建侯行师",
-        "nature": "愉悦和顺"
-    },
-    "坤_巽": {
-        "name": "地风升",
-        "meaning": "向上提升",
-        "description": "元亨用见大人",
-        "nature": "谦虚上进"
-    },
-    "坎_坤": {
-        "name": "水地比",
-        "meaning": "亲近团结",
-        "description": "吉原筮元永贞无咎",
-        "nature": "亲和团结"
-    },
-    "坤_坎": {
-        "name": "地水师",
-        "meaning": "众众齐心",
-        "description": "贞丈人吉无咎",
-        "nature": "统率群众"
-    },
-    "艮_坤": {
-        "name": "山地剥",
-        "meaning": "消退衰落",
-        "description": "不利有攸往",
-        "nature": "消退退守"
-    },
-    "坤_艮": {
-        "name": "地山谦",
-        "meaning": "谦逊虚心",
-        "description": "亨君子有终",
-        "nature": "谦虚自持"
-    },
-    "离_坤": {
-        "name": "火地晋",
-        "meaning": "循序渐进",
-        "description": "康侯用锡马蕃庶",
-        "nature": "稳健进取"
-    },
-    "坤_离": {
-        "name": "地火明夷",
-        "meaning": "晦暗不明",
-        "description": "利艰贞",
-        "nature": "晦暗隐忍"
-    },
-    "兑_坤": {
-        "name": "泽地萃",
-        "meaning": "聚集会合",
-        "description": "亨王假有庙",
-        "nature": "汇聚和合"
-    },
-    "坤_兑": {
-        "name": "地泽临",
-        "meaning": "临下观察",
-        "description": "元亨利贞",
-        "nature": "观察治理"
-    },
-    "震_震": {
-        "name": "震为雷",
-        "meaning": "震动不安",
-        "description": "亨",
-        "nature": "警觉恐惧"
-    },
-    "巽_震": {
-        "name": "风雷益",
-        "meaning": "损上益下",
-        "description": "利有攸往",
-        "nature": "利益他人"
-    },
-    "坎_震": {
-        "name": "水雷屯",
-        "meaning": "起始维艰",
-        "description": "元亨利贞",
-        "nature": "开始困难"
-    },
-    "震_坎": {
-        "name": "雷水解",
-        "meaning": "解除束缚",
-        "description": "利西南",
-        "nature": "解除困境"
-    },
-    "艮_震": {
-        "name": "山雷颐",
-        "meaning": "修养自身",
-        "description": "贞吉观颐",
-        "nature": "修身养性"
-    },
-    "震_艮": {
-        "name": "雷山小过",
-        "meaning": "行事谨慎",
-        "description": "亨利贞",
-        "nature": "谨小慎微"
-    },
-    "离_震": {
-        "name": "火雷噬嗑",
-        "meaning": "决断明确",
-        "description": "亨贞凶",
-        "nature": "明断果决"
-    },
-    "震_离": {
-        "name": "雷火丰",
-        "meaning": "盛大丰满",
-        "description": "亨小利有攸往",
-        "nature": "丰盛茂盛"
-    },
-    "兑_震": {
-        "name": "泽雷随",
-        "meaning": "顺从随和",
-        "description": "元亨利贞无咎",
-        "nature": "谦和顺从"
-    },
-    "震_兑": {
-        "name": "雷泽归妹",
-        "meaning": "依附从属",
-        "description": "征凶无攸利",
-        "nature": "归依服从"
-    },
-    "巽_巽": {
-        "name": "巽为风",
-        "meaning": "谦顺随和",
-        "description": "小亨利有攸往",
-        "nature": "柔顺谦和"
-    },
-    "坎_巽": {
-        "name": "水风井",
-        "meaning": "循序渐进",
-        "description": "改邑不改井",
-        "nature": "稳健进取"
-    },
-    "巽_坎": {
-        "name": "风水涣",
-        "meaning": "分散消散",
-        "description": "亨王假有庙",
-        "nature": "分散疏解"
-    },
-    "艮_巽": {
-        "name": "山风蛊",
-        "meaning": "振革补弊",
-        "description": "元亨利涉大川",
-        "nature": "改革创新"
-    },
-    "巽_艮": {
-        "name": "风山渐",
-        "meaning": "渐进发展",
-        "description": "女归吉利贞",
-        "nature": "循序渐进"
-    },
-    "离_巽": {
-        "name": "火风鼎",
-        "meaning": "稳重图变",
-        "description": "元吉亨",
-        "nature": "革故鼎新"
-    },
-    "巽_离": {
-        "name": "风火家人",
-        "meaning": "家庭和睦",
-        "description": "利女贞",
-        "nature": "和睦团结"
-    },
-    "兑_巽": {
-        "name": "泽风大过",
-        "meaning": "激动过度",
-        "description": "栋桡利有攸往",
-        "nature": "过分激进"
-    },
-    "巽_兑": {
-        "name": "风泽中孚",
-        "meaning": "诚信感通",
-        "description": "豚鱼吉利涉大川",
-        "nature": "诚信感人"
-    },
-    "坎_坎": {
-        "name": "坎为水",
-        "meaning": "险难重重",
-        "description": "有孚维心亨",
-        "nature": "险难困厄"
-    },
-    "艮_坎": {
-        "name": "山水蒙",
-        "meaning": "蒙昧初开",
-        "description": "亨匪我求童蒙",
-        "nature": "启蒙教化"
-    },
-    "坎_艮": {
-        "name": "水山蹇",
-        "meaning": "险难困阻",
-        "description": "利西南",
-        "nature": "艰难困阻"
-    },
-    "离_坎": {
-        "name": "火水未济",
-        "meaning": "事业未成",
-        "description": "亨小狐汔济",
-        "nature": "未竟之象"
-    },
-    "坎_离": {
-        "name": "水火既济",
-        "meaning": "成功亨通",
-        "description": "亨小利贞",
-        "nature": "功成名就"
-    },
-    "兑_坎": {
-        "name": "泽水困",
-        "meaning": "困难重重",
-        "description": "亨贞大人吉无咎",
-        "nature": "困境求变"
-    },
-    "坎_兑": {
-        "name": "水泽节",
-        "meaning": "节制适度",
-        "description": "亨苦节不可贞",
-        "nature": "节制自持"
-    },
-    "艮_艮": {
-        "name": "艮为山",
-        "meaning": "止而不进",
-        "description": "艮其背不获其身",
-        "nature": "稳重保守"
-    },
-    "离_艮": {
-        "name": "火山旅",
-        "meaning": "短暂停留",
-        "description": "小亨贞吉",
-        "nature": "漂泊不定"
-    },
-    "艮_离": {
-        "name": "山火贲",
-        "meaning": "文明美化",
-        "description": "亨小利有攸往",
-        "nature": "装饰美化"
-    },
-    "兑_艮": {
-        "name": "泽山咸",
-        "meaning": "互相感应",
-        "description": "亨利贞取女吉",
-        "nature": "感应相合"
-    },
-    "艮_兑": {
-        "name": "山泽损",
-        "meaning": "损上益下",
-        "description": "有孚元吉无咎",
-        "nature": "损益互补"
-    },
-    "离_离": {
-        "name": "离为火",
-        "meaning": "光明显著",
-        "description": "利贞亨畜牝牛吉",
-        "nature": "明亮光大"
-    },
-    "兑_离": {
-        "name": "泽火革",
-        "meaning": "改革创新",
-        "description": "己日乃孚元亨利贞",
-        "nature": "革故鼎新"
-    },
-    "离_兑": {
-        "name": "火泽睽",
-        "meaning": "乖违背反",
-        "description": "小事吉",
-        "nature": "乖违孤立"
-    },
-    "兑_兑": {
-        "name": "兑为泽",
-        "meaning": "喜悦和乐",
-        "description": "亨利贞",
-        "nature": "愉悦欢乐"
-    }
-}
-
-YAO_TEXT: Dict[str, Dict[int, str]] = {
-    "乾_乾": {
-        1: "潜龙勿用。",
-        2: "见龙在田，利见大人。",
-        3: "君子终日乾乾，夕惕若，厉无咎。",
-        4: "或跃在渊，无咎。",
-        5: "飞龙在天，利见大人。",
-        6: "亢龙有悔。"
-    },
-    "坤_坤": {
-        1: "履霜，坚冰至。",
-        2: "直方大，不习无不利。",
-        3: "含章可贞，或从王事，无成有终。",
-        4: "括囊，无咎无誉。",
-        5: "黄裳，元吉。",
-        6: "龙战于野，其血玄黄。"
-    },
-    "震_坎": {
-        1: "初六，磐桓，利居贞，利建侯。",
-        2: "六二，屯如邅如，乘马班如。匪寇婚媾，女子贞不字，十年乃字。",
-        3: "六三，即鹿无虞，惟入于林中。君子几不如舍，往吝。",
-        4: "六四，乘马班如，求婚媾，往吉，无不利。",
-        5: "九五，屯其膏，小贞吉，大贞凶。",
-        6: "上六，乘马班如，泣血涟如。"
-    },
-    "坎_乾": {
-        1: "初九，需于郊，利用恒，无咎。",
-        2: "九二，需于沙，小有言。",
-        3: "九三，需于泥，致寇至。",
-        4: "六四，需于血，出自穴。",
-        5: "九五，需于酒食，贞吉。",
-        6: "上六，入于穴，有不速之客三人来，敬之终吉。"
-    }
-}
\ No newline at end of file
+def __getattr__(name: str):
+    """HEXAGRAM_DATA、YAO_TEXT 源数据仅在访问时导入"""
+    if name in ("HEXAGRAM_DATA", "YAO_TEXT"):
+        from . import hexagram_texts
+        return getattr(hexagram_texts, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
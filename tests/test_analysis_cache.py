@@ -0,0 +1,47 @@
+from datetime import datetime
+
+import pytest
+
+from models.hexagram import FrozenHexagram
+from iching_core.analysis_cache import AnalysisCache
+from iching_core.analysis_result import InvalidSectionsError
+
+TIME = datetime(2024, 3, 5, 10, 30)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_hit_patches_time_and_topic():
+    cache = AnalysisCache()
+    first = cache.get(FrozenHexagram(9, 3, TIME, "a"))
+    later = TIME.replace(hour=11)
+    second = cache.get(FrozenHexagram(9, 3, later, "b"))
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert first["basic_info"]["topic"] == "a"
+    assert (second["basic_info"]["topic"], second["basic_info"]["time"]) == ("b", later)
+    assert first["hexagram_info"] is second["hexagram_info"]
+
+def test_lru_eviction_and_ttl():
+    clock = FakeClock()
+    cache = AnalysisCache(maxsize=2, ttl=10, clock=clock)
+    for code in (1, 2, 3):
+        cache.get(FrozenHexagram(code, 0, TIME))
+    assert cache.stats()["evictions"] == 1
+    clock.now = 11
+    cache.get(FrozenHexagram(3, 0, TIME))
+    assert cache.stats()["expirations"] == 1
+
+def test_selected_sections_only():
+    result = AnalysisCache().get(FrozenHexagram(9, 3, TIME), ["basic_info"])
+    assert list(result) == ["basic_info"]
+
+def test_invalid_sections_do_not_touch_cache():
+    cache = AnalysisCache()
+    with pytest.raises(InvalidSectionsError):
+        cache.get(FrozenHexagram(9, 3, TIME), ["basic_info", "bogus"])
+    assert cache.stats()["size"] == 0
+    assert (cache.hits, cache.misses) == (0, 0)
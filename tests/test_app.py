@@ -0,0 +1,42 @@
+import pytest
+
+import app as app_module
+from iching_core import frozen_record
+from iching_core.five_elements import FiveElements
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+def test_analyze_returns_full_report(client):
+    response = client.post("/analyze", json={"topic": "事业"})
+    assert response.status_code == 200
+    result = response.get_json()["result"]
+    assert set(result) == {"basic_info", "hexagram_info", "yao_layout", "relationships", "recommendations"}
+    assert result["basic_info"]["topic"] == "事业"
+
+def test_analyze_selected_fields(client):
+    response = client.post("/analyze?fields=basic_info,hexagram_info", json={"topic": ""})
+    assert set(response.get_json()["result"]) == {"basic_info", "hexagram_info"}
+
+def test_analyze_invalid_fields(client):
+    response = client.post("/analyze?fields=bogus", json={"topic": ""})
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+
+def test_status_routes(client):
+    assert client.get("/cache/stats").status_code == 200
+    assert client.get("/services/status").get_json()["initialized"] is True
+    assert client.get("/analysis/stats").status_code == 200
+
+def test_analyze_splices_frozen_fragments(client, monkeypatch):
+    # 嵌入片段时不再逐项展开 FrozenRecord；展开路径被调用即说明未嵌入
+    def unexpected(value):
+        raise AssertionError("FrozenRecord was re-encoded instead of spliced")
+
+    monkeypatch.setattr(frozen_record, "_plain", unexpected)
+    response = client.post("/analyze?fields=relationships", json={"topic": ""})
+    assert response.status_code == 200
+    text = response.get_data(as_text=True)
+    fragments = [record.json_fragment for record in FiveElements.ELEMENT_ATTRIBUTES.values()]
+    assert any(fragment in text for fragment in fragments)
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from iching_core.casting import CastRNG, CastingEngine, CoinEngine, get_engine
+from iching_core.hexagram_generator import HexagramGenerator
+
+TIME = datetime(2024, 3, 5, 10, 30)
+
+@pytest.mark.parametrize("method", ["coin", "yarrow", "plum_blossom"])
+def test_batch_matches_sequential_casts(method):
+    generator = HexagramGenerator(seed=42, stream=3, method=method)
+    batch = generator.generate_batch(200, start=0, times=[TIME] * 200)
+    for index in range(200):
+        hexagram = generator.cast(index, time=TIME)
+        assert hexagram.code == batch.codes[index]
+        assert hexagram.mask == batch.masks[index]
+        assert hexagram.changed_code == batch.changed_codes[index]
+
+def test_words_do_not_depend_on_chunking():
+    rng = CastRNG(7, 1)
+    whole = rng.words(0, 1000)
+    chunks = np.concatenate([rng.words(start, 137) for start in range(0, 1000, 137)])[:1000]
+    assert (whole == chunks).all()
+    assert rng.word(999) == whole[999]
+
+def test_streams_are_independent():
+    assert (CastRNG(7, 0).words(0, 64) != CastRNG(7, 1).words(0, 64)).any()
+
+def test_replay_reproduces_cast():
+    original = HexagramGenerator(seed=5, method="yarrow").generate_hexagram("topic", time=TIME)
+    replayed = HexagramGenerator.replay(original.seed, original.stream, original.cast_index,
+                                        "topic", "yarrow", TIME)
+    assert (replayed.code, replayed.mask, replayed.time) == (original.code, original.mask, original.time)
+
+def test_plum_blossom_batch_accepts_single_time():
+    generator = HexagramGenerator(seed=1, method="plum_blossom")
+    single = generator.generate_batch(4, start=0, times=TIME)
+    repeated = generator.generate_batch(4, start=0, times=[TIME] * 4)
+    assert (single.lines == repeated.lines).all()
+
+def test_default_cast_time_is_now():
+    generator = HexagramGenerator(seed=1)
+    before = datetime.now()
+    hexagram = generator.generate_hexagram()
+    assert before <= hexagram.time <= datetime.now()
+
+def test_incomplete_engine_fails_on_creation():
+    class HalfEngine(CastingEngine):
+        name = "half"
+
+        def cast(self, word, time, topic=""):
+            return (7,) * 6
+
+    with pytest.raises(TypeError):
+        HalfEngine()
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        get_engine("unknown")
+
+def test_custom_engine_instance_is_used_directly():
+    engine = CoinEngine()
+    assert get_engine(engine) is engine
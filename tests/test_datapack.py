@@ -0,0 +1,29 @@
+import pytest
+
+from models.datapack import DataPack, build_pack, write_pack
+from models.hexagram import HEXAGRAM_TABLE, YAO_TABLE, HEXAGRAM_KEYS
+from models.hexagram_texts import HEXAGRAM_DATA, YAO_TEXT
+
+RECORDS = [{"name": "乾", "text": "元亨利贞"}, {"name": "坤"}, {}]
+
+def test_round_trip_through_mmap(tmp_path):
+    path = str(tmp_path / "pack.bin")
+    write_pack(path, build_pack(RECORDS, ["name", "text"], data_version=5))
+    pack = DataPack.open(path)
+    assert (pack.record_count, pack.data_version, pack.fields) == (3, 5, ["name", "text"])
+    assert pack.get(0, "text") == "元亨利贞"
+    assert pack.get(1, "name") == "坤"
+    assert pack.get(1, "text") == ""
+    assert pack.get(2, "name") == ""
+
+def test_invalid_record_and_magic():
+    pack = DataPack(build_pack(RECORDS, ["name"]))
+    with pytest.raises(IndexError):
+        pack.get(3, "name")
+    with pytest.raises(ValueError):
+        DataPack(b"XXXX" + bytes(64))
+
+def test_text_tables_match_source_data():
+    for code, key in enumerate(HEXAGRAM_KEYS):
+        assert dict(HEXAGRAM_TABLE[code]) == dict(HEXAGRAM_DATA.get(key, {}))
+        assert dict(YAO_TABLE[code]) == dict(YAO_TEXT.get(key, {}))
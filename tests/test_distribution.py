@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from iching_core.casting import get_engine
+from iching_core.distribution import outcome_distribution
+from iching_core.simulation import SimulationStats
+from iching_core.hexagram_generator import HexagramGenerator
+
+@pytest.mark.parametrize("method", ["coin", "yarrow"])
+def test_distribution_sums_to_one(method):
+    distribution = outcome_distribution(method)
+    assert distribution.joint.sum() == pytest.approx(1.0)
+    for marginal in (distribution.by_hexagram, distribution.by_changed_hexagram,
+                     distribution.by_palace, distribution.by_changing_count):
+        assert marginal.sum() == pytest.approx(1.0)
+
+@pytest.mark.parametrize("method", ["coin", "yarrow"])
+def test_changing_position_matches_line_probabilities(method):
+    p6, _, _, p9 = get_engine(method).line_probabilities
+    assert outcome_distribution(method).by_changing_position == pytest.approx([p6 + p9] * 6)
+
+def test_time_method_has_no_distribution():
+    with pytest.raises(ValueError):
+        outcome_distribution("plum_blossom")
+
+def test_simulation_fits_distribution():
+    stats = SimulationStats().update(HexagramGenerator(seed=11).generate_batch(200_000, start=0))
+    assert stats.chi_square("coin")["hexagram"]["p_value"] > 0.001
+    assert np.abs(stats.by_hexagram() / stats.casts - outcome_distribution("coin").by_hexagram).max() < 0.005
@@ -0,0 +1,32 @@
+import json
+from datetime import datetime
+
+from iching_core import frozen_record
+from iching_core.frozen_record import FrozenRecord
+
+RECORD = FrozenRecord({"b": [1, 2], "a": {"名": "木"}})
+
+def test_record_is_read_only_mapping():
+    assert dict(RECORD) == {"b": (1, 2), "a": RECORD["a"]}
+    assert isinstance(RECORD["a"], FrozenRecord)
+
+def test_fragment_format_splices():
+    text = frozen_record.dumps({"x": RECORD}, **frozen_record.FRAGMENT_FORMAT)
+    assert text == '{"x":' + RECORD.json_fragment + "}"
+
+def test_other_formats_match_plain_json():
+    value = {"z": RECORD, "topic": "\\u0000"}
+    plain = {"z": {"b": [1, 2], "a": {"名": "木"}}, "topic": "\\u0000"}
+    for kwargs in ({}, {"sort_keys": True}, {"ensure_ascii": False, "indent": 2}):
+        assert frozen_record.dumps(value, **kwargs) == json.dumps(plain, **kwargs)
+
+def test_reports_and_dates():
+    time = datetime(2024, 3, 5, 10, 30)
+    assert json.loads(frozen_record.dumps({"time": time})) == {"time": "2024-03-05T10:30:00"}
+
+def test_full_report_serializes():
+    from models.hexagram import FrozenHexagram
+    from iching_core.hexagram_analyzer import HexagramAnalyzer
+
+    report = HexagramAnalyzer(FrozenHexagram(9, 3, datetime(2024, 3, 5))).generate_analysis()
+    assert set(json.loads(frozen_record.dumps(report))) == set(report)
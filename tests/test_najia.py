@@ -0,0 +1,53 @@
+import pytest
+
+from models.hexagram import hexagram_code
+from iching_core.relationship_analyzer import find_fu_shen, najia, six_spirits
+from iching_core.trigrams import Trigrams
+
+# 乾宫八卦：(下卦, 上卦, 世代, 世, 应)
+QIAN_PALACE = [
+    ("乾", "乾", "本宫", 6, 3),
+    ("巽", "乾", "一世", 1, 4),
+    ("艮", "乾", "二世", 2, 5),
+    ("坤", "乾", "三世", 3, 6),
+    ("坤", "巽", "四世", 4, 1),
+    ("坤", "艮", "五世", 5, 2),
+    ("坤", "离", "游魂", 4, 1),
+    ("乾", "离", "归魂", 3, 6),
+]
+
+@pytest.mark.parametrize("lower, upper, generation, shi, ying", QIAN_PALACE)
+def test_qian_palace(lower, upper, generation, shi, ying):
+    info = najia(hexagram_code(lower, upper))
+    assert (info.palace, info.generation, info.shi, info.ying) == ("乾", generation, shi, ying)
+
+def test_qian_gan_zhi_and_relatives():
+    info = najia(hexagram_code("乾", "乾"))
+    assert info.gan_zhi == ("甲子水", "甲寅木", "甲辰土", "壬午火", "壬申金", "壬戌土")
+    assert info.relatives == ("子孙", "妻财", "父母", "官鬼", "兄弟", "父母")
+
+def test_ji_ji_belongs_to_kan_palace():
+    info = najia(hexagram_code("离", "坎"))
+    assert (info.palace, info.generation, info.shi) == ("坎", "三世", 3)
+    assert find_fu_shen(hexagram_code("离", "坎"), "妻财").gan_zhi == "戊午火"
+
+def test_gou_hidden_wealth():
+    fu_shen = find_fu_shen(hexagram_code("巽", "乾"), "妻财")
+    assert (fu_shen.position, fu_shen.gan_zhi) == (2, "甲寅木")
+
+def test_six_spirits_by_day_stem():
+    assert six_spirits("甲") == ("青龙", "朱雀", "勾陈", "螣蛇", "白虎", "玄武")
+    assert six_spirits("戊")[0] == "勾陈"
+    assert six_spirits("壬")[0] == "玄武"
+
+@pytest.mark.parametrize("lines, name", [
+    ((1, 0, 0), "震"), ((0, 0, 1), "艮"), ((1, 1, 0), "兑"), ((0, 1, 1), "巽"),
+    ((1, 1, 1), "乾"), ((0, 0, 0), "坤"), ((0, 1, 0), "坎"), ((1, 0, 1), "离"),
+])
+def test_trigram_lines_are_bottom_first(lines, name):
+    assert Trigrams.get_trigram_by_lines(list(lines)) == name
+    assert hexagram_code(name, "坤") & 7 == lines[0] | lines[1] << 1 | lines[2] << 2
+
+def test_invalid_trigram_lines():
+    with pytest.raises(ValueError):
+        Trigrams.get_trigram_by_lines([1, 2, 0])
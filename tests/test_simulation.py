@@ -0,0 +1,39 @@
+import pytest
+
+from iching_core.casting import CoinEngine
+from iching_core.simulation import CastSimulator
+
+class CustomCoinEngine(CoinEngine):
+    name = "custom_coin"
+
+def test_chunk_size_does_not_change_results():
+    small = CastSimulator(seed=3, chunk_size=700)
+    large = CastSimulator(seed=3, chunk_size=10_000)
+    small.run(5000)
+    large.run(5000)
+    assert (small.stats.joint == large.stats.joint).all()
+
+def test_checkpoint_resume_matches_uninterrupted_run(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    interrupted = CastSimulator(seed=3, chunk_size=1000)
+    interrupted.run(3000, checkpoint_path=path)
+    resumed = CastSimulator.resume(path)
+    resumed.run(2000)
+
+    uninterrupted = CastSimulator(seed=3, chunk_size=1000)
+    uninterrupted.run(5000)
+    assert resumed.next_index == 5000
+    assert (resumed.stats.joint == uninterrupted.stats.joint).all()
+
+def test_parallel_run_with_custom_engine():
+    parallel = CastSimulator(seed=3, method=CustomCoinEngine(), chunk_size=1000)
+    parallel.run_parallel(4000, workers=2)
+    serial = CastSimulator(seed=3, method=CustomCoinEngine(), chunk_size=1000)
+    serial.run(4000)
+    assert (parallel.stats.joint == serial.stats.joint).all()
+
+def test_unregistered_engine_cannot_be_checkpointed(tmp_path):
+    simulator = CastSimulator(seed=3, method=CustomCoinEngine())
+    with pytest.raises(ValueError):
+        simulator.run(10, checkpoint_path=str(tmp_path / "checkpoint.json"))
+    assert simulator.next_index == 0
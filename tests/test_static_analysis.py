@@ -0,0 +1,65 @@
+from collections.abc import Mapping
+from datetime import datetime
+
+import pytest
+
+from models.datapack import DataPack
+from models.hexagram import FrozenHexagram
+from iching_core.hexagram_analyzer import HexagramAnalyzer
+from iching_core.static_analysis import (
+    STATIC_SECTIONS, build_static_analysis, decode_value, encode_value,
+    get_static_analysis, set_static_analysis
+)
+from iching_core import services, static_analysis
+from iching_core.frozen_record import FrozenRecord
+
+@pytest.fixture(scope="module")
+def static_pack():
+    previous = get_static_analysis()
+    pack = DataPack(build_static_analysis())
+    set_static_analysis(pack)
+    yield pack
+    set_static_analysis(previous)
+
+def assert_same(live, static, path="$"):
+    """值与类型均一致（逐层比较）"""
+    assert type(live) is type(static), path
+    if isinstance(live, Mapping):
+        assert list(live) == list(static), path
+        for key in live:
+            assert_same(live[key], static[key], f"{path}.{key}")
+    elif isinstance(live, (list, tuple)):
+        assert len(live) == len(static), path
+        for index, (a, b) in enumerate(zip(live, static)):
+            assert_same(a, b, f"{path}[{index}]")
+    else:
+        assert live == static, path
+
+@pytest.mark.parametrize("code", [0, 9, 21, 42, 63])
+@pytest.mark.parametrize("mask", [0, 1, 18, 63])
+def test_static_sections_equal_live(static_pack, code, mask):
+    hexagram = FrozenHexagram(code, mask, datetime(2024, 3, 5))
+    live = HexagramAnalyzer(hexagram, use_static=False)
+    static = HexagramAnalyzer(hexagram)
+    for method in STATIC_SECTIONS.values():
+        assert_same(getattr(live, method)(), getattr(static, method)())
+
+def test_static_sections_are_decoded_once(static_pack):
+    hexagram = FrozenHexagram(5, 3, datetime(2024, 3, 5))
+    first = HexagramAnalyzer(hexagram).analyze_directions()
+    assert HexagramAnalyzer(hexagram).analyze_directions() is first
+
+def test_encoding_round_trip():
+    value = {"a": (1, [2, (3,)]), "b": FrozenRecord({"c": [1, 2]}), "d": [{"e": ()}]}
+    assert_same(value, decode_value(encode_value(value)))
+
+def test_status_does_not_load_pack(monkeypatch):
+    def unexpected(path=None):
+        raise AssertionError("status() loaded the static pack")
+
+    monkeypatch.setattr(static_analysis, "_pack_loaded", False)
+    monkeypatch.setattr(static_analysis, "_pack", None)
+    monkeypatch.setattr(static_analysis, "load_static_analysis", unexpected)
+    assert services.status()["static_analysis"] is None
+    monkeypatch.setattr(static_analysis, "_pack_loaded", True)
+    assert services.status()["static_analysis"] is False